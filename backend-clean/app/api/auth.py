@@ -2,14 +2,16 @@
 Authentication API Routes
 """
 from datetime import timedelta
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
-from app.core.database import AsyncSessionWrapper
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import get_cache
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.responses import ORJSONResponse, etag_for, is_not_modified
 from app.core.security import (
     create_access_token,
     get_current_user,
@@ -22,10 +24,44 @@ from app.schemas.user import UserCreate, UserResponse, UserLogin
 
 router = APIRouter()
 
+# Mock units for now - will be implemented properly later
+_DEFAULT_UNITS: Tuple[Dict[str, str], ...] = (
+    {"id": "hotel-1", "name": "Hotel Unit 1", "code": "HOTEL001"},
+)
+
+# Serialized UserResponse payloads; a profile change bumps updated_at and
+# therefore the key, so stale entries are simply never hit again
+_user_response_cache = get_cache("user_responses", ttl=300, maxsize=1024)
+
+
+def _user_response(user: User) -> Dict[str, Any]:
+    """Serialize a user to its UserResponse JSON form, memoized per version."""
+    key = (user.id, user.updated_at)
+    data = _user_response_cache.get(key)
+    if data is None:
+        data = UserResponse.model_validate(user).model_dump(mode="json")
+        _user_response_cache[key] = data
+    return data
+
+
+def _build_token_response(user: User) -> Dict[str, Any]:
+    """Issue an access token and build the Token payload for a logged-in user."""
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        subject=user.id, expires_delta=access_token_expires
+    )
+    
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user": _user_response(user),
+        "units": _DEFAULT_UNITS
+    }
+
 
 @router.post("/login", response_model=Token)
 async def login_for_access_token(
-    db: AsyncSessionWrapper = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """OAuth2 compatible token login."""
@@ -44,28 +80,13 @@ async def login_for_access_token(
             detail="Inactive user"
         )
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        subject=user.id, expires_delta=access_token_expires
-    )
-    
-    # Mock units for now - will be implemented properly later
-    units = [
-        {"id": "hotel-1", "name": "Hotel Unit 1", "code": "HOTEL001"}
-    ]
-    
-    return Token(
-        access_token=access_token,
-        token_type="bearer",
-        user=UserResponse.from_orm(user),
-        units=units
-    )
+    return ORJSONResponse(_build_token_response(user))
 
 
 @router.post("/login/json", response_model=Token)
 async def login_json(
     user_in: UserLogin,
-    db: AsyncSessionWrapper = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """JSON login endpoint for frontend applications."""
     user = await crud_user.authenticate(
@@ -82,33 +103,18 @@ async def login_json(
             detail="Inactive user"
         )
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        subject=user.id, expires_delta=access_token_expires
-    )
-    
-    # Mock units for now
-    units = [
-        {"id": "hotel-1", "name": "Hotel Unit 1", "code": "HOTEL001"}
-    ]
-    
-    return Token(
-        access_token=access_token,
-        token_type="bearer",
-        user=UserResponse.from_orm(user),
-        units=units
-    )
+    return ORJSONResponse(_build_token_response(user))
 
 
 @router.post("/register", response_model=UserResponse)
 async def register(
     user_in: UserCreate,
-    db: AsyncSessionWrapper = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """Create new user - open registration."""
     try:
         user = await crud_user.create(db, obj_in=user_in)
-        return UserResponse.from_orm(user)
+        return UserResponse.model_validate(user)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -118,10 +124,18 @@ async def register(
 
 @router.get("/me", response_model=UserResponse)
 async def read_users_me(
+    request: Request,
     current_user: User = Depends(get_current_user)
 ) -> Any:
-    """Get current user profile."""
-    return UserResponse.from_orm(current_user)
+    """Get current user profile (304 if the client's copy is current)."""
+    etag = etag_for(current_user.updated_at, current_user.id)
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    response = ORJSONResponse(_user_response(current_user))
+    if etag:
+        response.headers["ETag"] = etag
+    return response
 
 
 @router.post("/test-token", response_model=UserResponse)
@@ -129,4 +143,4 @@ async def test_token(
     current_user: User = Depends(get_current_user)
 ) -> Any:
     """Test access token."""
-    return UserResponse.from_orm(current_user)
+    return ORJSONResponse(_user_response(current_user))
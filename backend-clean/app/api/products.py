@@ -1,375 +1,597 @@
 """
 Products API endpoints for the Hotel Procurement System - Enhanced E-catalogue
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+import uuid
+from typing import AsyncIterator, List, Optional, Set
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import StreamingResponse
 from uuid import UUID
 from datetime import datetime
 
-from app.core.database import get_db
-from sqlalchemy.orm import Session
-from app.core.security import get_current_user
+from sqlalchemy import Boolean, Integer, String, bindparam, false, func, or_, select, text, true, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import clear_cache, get_cache, singleflight
+from app.core.database import AsyncSessionLocal, get_async_db
+from app.core.pagination import (
+    NEXT_CURSOR_HEADER, STREAM_THRESHOLD, TOTAL_COUNT_HEADER, decode_name_cursor, encode_cursor,
+    name_page_response
+)
+from app.core.responses import ORJSONResponse, etag_for, is_not_modified, iter_json_array
+from app.core.security import get_current_user, require_roles
+from app.models.ecatalogue import e_catalogue_view
+from app.models.product import Product as ProductModel
 from app.models.user import User
 from app.schemas.product import (
     Product, ProductCreate, ProductUpdate, ECatalogueProduct,
     ProductCategory, ProductCategoryCreate, ProductCategoryUpdate,
-    StockUpdate, ConsumptionRateUpdate
+    ProductSummary, StockUpdate, BulkStockUpdate, ConsumptionRateUpdate
 )
 
 router = APIRouter()
 
-@router.get("/", response_model=List[ECatalogueProduct])
-async def get_products(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
-    category_id: Optional[str] = Query(None, description="Filter by category ID"),
-    supplier_id: Optional[str] = Query(None, description="Filter by supplier ID"),
-    unit_id: Optional[str] = Query(None, description="Filter by unit ID"),
-    stock_status: Optional[str] = Query(None, description="Filter by stock status"),
-    search: Optional[str] = Query(None, description="Search in name, code, or description"),
-    db: AsyncSessionWrapper = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Get all products with E-catalogue information"""
-    from sqlalchemy import text
-    
-    # Use the exact same pattern as the working e-catalogue endpoint
-    query = "SELECT * FROM e_catalogue_view WHERE is_active = true"
-    params = {"limit": limit, "skip": skip}
-    conditions = []
-    
-    if category_id:
-        conditions.append("category_id = :category_id")
-        params["category_id"] = category_id
+# Role gates for catalogue maintenance and stock-level updates
+require_manager = require_roles(frozenset({"manager", "superuser"}))
+require_stock_manager = require_roles(frozenset({"manager", "superuser", "store_manager"}))
+
+# Categories change rarely; serve them from memory for a short window
+CATEGORIES_CACHE = "product_categories"
+_categories_cache = get_cache(CATEGORIES_CACHE, ttl=60)
+
+# Catalogue pages fetched ahead of the client on ?prefetch=true, keyed by bind params
+CATALOGUE_PAGES_CACHE = "catalogue_pages"
+_catalogue_pages_cache = get_cache(CATALOGUE_PAGES_CACHE, ttl=30, maxsize=128)
+
+# Strong references to running prefetch tasks so they are not garbage collected
+_prefetch_tasks: Set[asyncio.Task] = set()
+
+def _row_to_ecatalogue(row, _float=float, _str=str) -> dict:
+    """
+    Build the full E-catalogue response for a single product row mapping.
     
-    if supplier_id:
-        conditions.append("supplier_id = :supplier_id")
-        params["supplier_id"] = supplier_id
+    Every catalogue payload, list pages included, goes through here so a
+    product looks the same whichever endpoint returns it.
     
-    if unit_id:
-        conditions.append("unit_id = :unit_id")
-        params["unit_id"] = unit_id
-        
-    if stock_status:
-        conditions.append("stock_status = :stock_status")
-        params["stock_status"] = stock_status
+    float/str are bound as default arguments so the many per-field
+    conversions are local lookups rather than global/builtin ones.
+    """
+    category_id = row["category_id"]
+    supplier_id = row["supplier_id"]
+    unit_id = row["unit_id"]
+    standard_cost = row["standard_cost"]
+    contract_price = row["contract_price"]
+    effective_unit_price = row["effective_unit_price"]
+    current_stock_quantity = row["current_stock_quantity"]
+    consumption_rate = row["estimated_consumption_rate_per_day"]
+    days_left = row["estimated_days_stock_will_last"]
+    last_restocked_date = row["last_restocked_date"]
+    last_consumption_update = row["last_consumption_update"]
+    created_at = row["created_at"]
+    updated_at = row["updated_at"]
+    return {
+        "id": _str(row["id"]),
+        "name": row["name"],
+        "code": row["code"],
+        "description": row["description"],
+        "category_id": _str(category_id) if category_id is not None else None,
+        "category_name": row["category_name"],
+        "category_code": row["category_code"],
+        "unit_of_measure": row["unit_of_measure"],
+        "standard_cost": _float(standard_cost) if standard_cost is not None else None,
+        "contract_price": _float(contract_price) if contract_price is not None else None,
+        "effective_unit_price": _float(effective_unit_price) if effective_unit_price is not None else None,
+        "currency": row["currency"],
+        "current_stock_quantity": _float(current_stock_quantity) if current_stock_quantity is not None else 0,
+        "minimum_stock_level": row["minimum_stock_level"],
+        "maximum_stock_level": row["maximum_stock_level"],
+        "reorder_point": row["reorder_point"],
+        "estimated_consumption_rate_per_day": _float(consumption_rate) if consumption_rate is not None else 0,
+        "estimated_days_stock_will_last": _float(days_left) if days_left is not None else None,
+        "stock_status": row["stock_status"],
+        "supplier_id": _str(supplier_id) if supplier_id is not None else None,
+        "supplier_name": row["supplier_name"],
+        "supplier_code": row["supplier_code"],
+        "unit_id": _str(unit_id) if unit_id is not None else None,
+        "unit_name": row["unit_name"],
+        "unit_code": row["unit_code"],
+        "specifications": row["specifications"],
+        "is_active": row["is_active"],
+        "last_restocked_date": last_restocked_date.isoformat() if last_restocked_date else None,
+        "last_consumption_update": last_consumption_update.isoformat() if last_consumption_update else None,
+        "created_at": created_at.isoformat() if created_at else None,
+        "updated_at": updated_at.isoformat() if updated_at else None
+    }
+
+# Builds the E-catalogue row for a products row returned by a data-modifying
+# CTE named "changed". That row is not yet visible to e_catalogue_view, so the
+# category/supplier/unit names are joined onto it here instead.
+_ECATALOGUE_FROM_CHANGED = """
+    SELECT
+        c.id, c.name, c.code, c.description, c.category_id,
+        pc.name AS category_name, pc.code AS category_code,
+        c.unit_of_measure, c.standard_cost, c.contract_price,
+        c.effective_unit_price, c.currency, c.current_stock_quantity,
+        c.minimum_stock_level, c.maximum_stock_level, c.reorder_point,
+        c.estimated_consumption_rate_per_day, c.estimated_days_stock_will_last,
+        c.stock_status,
+        c.supplier_id, s.name AS supplier_name, s.code AS supplier_code,
+        c.unit_id, u.name AS unit_name, u.code AS unit_code,
+        c.specifications, c.is_active, c.last_restocked_date,
+        c.last_consumption_update, c.created_at, c.updated_at
+    FROM changed c
+    LEFT JOIN product_categories pc ON c.category_id = pc.id
+    LEFT JOIN suppliers s ON c.supplier_id = s.id
+    LEFT JOIN units u ON c.unit_id = u.id
+"""
+
+# Statements with no per-request shape are built once at import time
+_CATEGORIES_QUERY = text("""
+    SELECT id, name, code, description, parent_category_id, is_active,
+           created_at, updated_at
+    FROM product_categories 
+    WHERE is_active = true
+    ORDER BY name
+""")
+
+_INSERT_CATEGORY = text("""
+    INSERT INTO product_categories (id, name, code, description, parent_category_id, is_active)
+    VALUES (:id, :name, :code, :description, :parent_category_id, :is_active)
+    RETURNING id, name, code, description, parent_category_id, is_active, created_at, updated_at
+""")
+
+_INSERT_PRODUCT = """
+    INSERT INTO products (
+        id, name, code, description, category_id, unit_of_measure,
+        standard_cost, contract_price, currency,
+        current_stock_quantity, minimum_stock_level, maximum_stock_level,
+        reorder_point, estimated_consumption_rate_per_day,
+        supplier_id, unit_id, specifications, is_active
+    )
+    VALUES (
+        :id, :name, :code, :description, :category_id, :unit_of_measure,
+        :standard_cost, :contract_price, :currency,
+        :current_stock_quantity, :minimum_stock_level, :maximum_stock_level,
+        :reorder_point, :estimated_consumption_rate_per_day,
+        :supplier_id, :unit_id, :specifications, :is_active
+    )
+"""
+
+_INSERT_PRODUCT_ROW = text(_INSERT_PRODUCT)
+
+_CREATE_PRODUCT = text(
+    "WITH changed AS (" + _INSERT_PRODUCT + " RETURNING *)" + _ECATALOGUE_FROM_CHANGED
+)
+
+_SET_STOCK = text("""
+    WITH changed AS (
+        UPDATE products 
+        SET current_stock_quantity = :quantity,
+            last_restocked_date = :restock_date,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = :product_id AND is_active = true
+        RETURNING *
+    )
+""" + _ECATALOGUE_FROM_CHANGED)
+
+_SET_CONSUMPTION_RATE = text("""
+    WITH changed AS (
+        UPDATE products 
+        SET estimated_consumption_rate_per_day = :rate,
+            last_consumption_update = :update_date,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = :product_id AND is_active = true
+        RETURNING *
+    )
+""" + _ECATALOGUE_FROM_CHANGED)
+
+# Set stock for many products in one statement. The rows arrive as three
+# parallel arrays, so the SQL text is the same whatever the batch size.
+_BULK_SET_STOCK = text("""
+    UPDATE products p
+    SET current_stock_quantity = v.quantity,
+        last_restocked_date = v.restock_date,
+        updated_at = CURRENT_TIMESTAMP
+    FROM unnest(
+        CAST(:product_ids AS uuid[]),
+        CAST(:quantities AS numeric[]),
+        CAST(:restock_dates AS timestamptz[])
+    ) AS v(id, quantity, restock_date)
+    WHERE p.id = v.id AND p.is_active = true
+    RETURNING p.id
+""")
+
+_DEACTIVATE_PRODUCT = text("""
+    UPDATE products 
+    SET is_active = false, updated_at = CURRENT_TIMESTAMP
+    WHERE id = :product_id AND is_active = true
+    RETURNING id
+""")
+
+def _unless_null(column, name: str):
+    """column = :name, or no filter at all when :name is bound to NULL."""
+    param = bindparam(name, type_=column.type)
+    return or_(param.is_(None), column == param)
+
+def _search_clause(*columns):
+    """
+    lower(column) LIKE :search on any of the columns, or no filter when :search is NULL.
     
+    :search is lower-cased by _page_params, so each column matches against the
+    lower(...) expression indexes from sql_setup/09.
+    """
+    search = bindparam("search", type_=String)
+    return or_(search.is_(None), *[func.lower(column).like(search) for column in columns])
+
+def _after_clause(name_column, id_column):
+    """Keyset seek past (:after_name, :after_id), or no filter on the first page."""
+    after_name = bindparam("after_name", type_=name_column.type)
+    after_id = bindparam("after_id", type_=id_column.type)
+    return or_(after_name.is_(None), tuple_(name_column, id_column) > tuple_(after_name, after_id))
+
+# The list statements are built once from a fixed table of conditions. Unused
+# filters are bound to NULL rather than left out, so each endpoint always sends
+# the same SQL text and asyncpg reuses one prepared statement for every
+# filter combination.
+_view = e_catalogue_view.c
+_low_stock_only = bindparam("low_stock_only", type_=Boolean)
+_CATALOGUE_FILTERS = (
+    _view.is_active == true(),
+    _unless_null(_view.category_id, "category_id"),
+    _unless_null(_view.supplier_id, "supplier_id"),
+    _unless_null(_view.unit_id, "unit_id"),
+    _unless_null(_view.stock_status, "stock_status"),
+    or_(_low_stock_only == false(), _view.stock_status.in_(["LOW_STOCK", "REORDER_NEEDED"])),
+    _search_clause(_view.name, _view.code, _view.description)
+)
+_CATALOGUE_PAGE = (
+    select(e_catalogue_view)
+    .where(*_CATALOGUE_FILTERS, _after_clause(_view.name, _view.id))
+    .order_by(_view.name, _view.id)
+    .limit(bindparam("limit", type_=Integer))
+    .offset(bindparam("skip", type_=Integer))
+)
+_CATALOGUE_COUNT = select(func.count()).select_from(e_catalogue_view).where(*_CATALOGUE_FILTERS)
+# Sort key of the last row on a page, for the cursor header of a streamed page
+_CATALOGUE_PAGE_END = (
+    select(_view.name, _view.id)
+    .where(*_CATALOGUE_FILTERS, _after_clause(_view.name, _view.id))
+    .order_by(_view.name, _view.id)
+    .limit(1)
+    .offset(bindparam("last_offset", type_=Integer))
+)
+
+_products = ProductModel.__table__.c
+_SUMMARY_PAGE = (
+    select(_products.id, _products.name, _products.code, _products.standard_cost, _products.currency)
+    .where(
+        _products.is_active == true(),
+        _unless_null(_products.category_id, "category_id"),
+        _search_clause(_products.name, _products.code),
+        _after_clause(_products.name, _products.id)
+    )
+    .order_by(_products.name, _products.id)
+    .limit(bindparam("limit", type_=Integer))
+    .offset(bindparam("skip", type_=Integer))
+)
+
+def _page_params(
+    skip: int, limit: int, after: Optional[str], search: Optional[str], search_prefix: bool = False
+) -> dict:
+    """Bind values shared by the list statements: paging, cursor and search."""
+    after_name, after_id = decode_name_cursor(after) if after else (None, None)
     if search:
-        conditions.append("(name ILIKE :search OR code ILIKE :search OR description ILIKE :search)")
-        params["search"] = f"%{search}%"
-    
-    if conditions:
-        query += " AND " + " AND ".join(conditions)
-    
-    query += " ORDER BY name LIMIT :limit OFFSET :skip"
+        # A prefix pattern can be answered from the btree indexes alone
+        search = f"{search.lower()}%" if search_prefix else f"%{search.lower()}%"
+    return {
+        "skip": skip,
+        "limit": limit,
+        "after_name": after_name,
+        "after_id": after_id,
+        "search": search or None
+    }
+
+async def _fetch_catalogue_rows(db: AsyncSession, params: dict) -> List[dict]:
+    """Run _CATALOGUE_PAGE, serving it from the prefetched pages when possible."""
+    rows = _catalogue_pages_cache.get(tuple(sorted(params.items())))
+    if rows is None:
+        result = await db.execute(_CATALOGUE_PAGE, params)
+        rows = [_row_to_ecatalogue(row) for row in result.mappings()]
+    return rows
+
+async def _prefetch_catalogue_rows(params: dict) -> None:
+    """Load a catalogue page into the page cache on a session of its own."""
+    key = tuple(sorted(params.items()))
+    if key in _catalogue_pages_cache:
+        return
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(_CATALOGUE_PAGE, params)
+            _catalogue_pages_cache[key] = [_row_to_ecatalogue(row) for row in result.mappings()]
+    except Exception:
+        # A failed prefetch only means the next request queries as usual
+        pass
+
+def _schedule_prefetch(rows: List[dict], params: dict) -> None:
+    """Start loading the page after rows while the client renders this one."""
+    if len(rows) < params["limit"]:
+        return
+    last = rows[-1]
+    # Same bind values the client produces when it sends back X-Next-Cursor
+    next_params = dict(params, skip=0, after_name=last["name"], after_id=UUID(last["id"]))
+    task = asyncio.create_task(_prefetch_catalogue_rows(next_params))
+    _prefetch_tasks.add(task)
+    task.add_done_callback(_prefetch_tasks.discard)
+
+async def _count_catalogue_rows(params: dict) -> int:
+    """
+    Run _CATALOGUE_COUNT on a pooled session of its own.
     
-    result = await db.execute(text(query), params)
+    A session can only run one statement at a time, so this is what lets the
+    count be in flight together with the page query.
+    """
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(_CATALOGUE_COUNT, params)
+
+async def _stream_catalogue_rows(params: dict) -> AsyncIterator[dict]:
+    """
+    Yield _CATALOGUE_PAGE rows from a server-side cursor.
     
-    products = []
-    for row in result:
-        products.append({
-            "id": str(row.id),
-            "name": row.name,
-            "code": row.code,
-            "description": row.description,
-            "category_name": row.category_name,
-            "unit_of_measure": row.unit_of_measure,
-            "effective_unit_price": float(row.effective_unit_price) if row.effective_unit_price else None,
-            "contract_price": float(row.contract_price) if row.contract_price else None,
-            "standard_cost": float(row.standard_cost) if row.standard_cost else None,
-            "currency": row.currency,
-            "current_stock_quantity": float(row.current_stock_quantity) if row.current_stock_quantity else 0,
-            "minimum_stock_level": row.minimum_stock_level,
-            "maximum_stock_level": row.maximum_stock_level,
-            "reorder_point": row.reorder_point,
-            "estimated_consumption_rate_per_day": float(row.estimated_consumption_rate_per_day) if row.estimated_consumption_rate_per_day else 0,
-            "estimated_days_stock_will_last": float(row.estimated_days_stock_will_last) if row.estimated_days_stock_will_last else None,
-            "stock_status": row.stock_status,
-            "supplier_name": row.supplier_name,
-            "unit_name": row.unit_name,
-            "specifications": row.specifications,
-            "is_active": row.is_active,
-            "last_restocked_date": row.last_restocked_date.isoformat() if row.last_restocked_date else None,
-            "created_at": row.created_at.isoformat() if row.created_at else None,
-            "updated_at": row.updated_at.isoformat() if row.updated_at else None
-        })
+    The body is sent after the handler returns, so the cursor runs on its own
+    session rather than the request's.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(_CATALOGUE_PAGE, params)
+        async for row in result.mappings():
+            yield _row_to_ecatalogue(row)
+
+async def _streamed_catalogue_page(db: AsyncSession, params: dict, include_total: bool) -> StreamingResponse:
+    """Stream a large catalogue page, resolving its headers before the body starts."""
+    params = dict(params, last_offset=params["skip"] + params["limit"] - 1)
+    if include_total:
+        end_result, total = await asyncio.gather(
+            db.execute(_CATALOGUE_PAGE_END, params), _count_catalogue_rows(params)
+        )
+    else:
+        end_result, total = await db.execute(_CATALOGUE_PAGE_END, params), None
+    
+    response = StreamingResponse(
+        iter_json_array(_stream_catalogue_rows(params)), media_type="application/json"
+    )
+    last = end_result.first()
+    if last is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.name, last.id)
+    if total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+    return response
+
+async def _catalogue_page(db: AsyncSession, params: dict, include_total: bool, prefetch: bool) -> Response:
+    """Run _CATALOGUE_PAGE, optionally with _CATALOGUE_COUNT alongside it."""
+    if params["limit"] > STREAM_THRESHOLD and not prefetch:
+        return await _streamed_catalogue_page(db, params, include_total)
+    
+    if include_total:
+        rows, total = await asyncio.gather(
+            _fetch_catalogue_rows(db, params), _count_catalogue_rows(params)
+        )
+    else:
+        rows, total = await _fetch_catalogue_rows(db, params), None
     
-    return products
+    if prefetch:
+        _schedule_prefetch(rows, params)
+    return name_page_response(rows, params["limit"], total)
+
+@router.get("/", response_class=ORJSONResponse, responses={200: {"model": List[ECatalogueProduct]}})
+async def get_products(
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    category_id: Optional[UUID] = Query(None, description="Filter by category ID"),
+    supplier_id: Optional[UUID] = Query(None, description="Filter by supplier ID"),
+    unit_id: Optional[UUID] = Query(None, description="Filter by unit ID"),
+    stock_status: Optional[str] = Query(None, description="Filter by stock status"),
+    search: Optional[str] = Query(None, description="Search in name, code, or description"),
+    search_prefix: bool = Query(False, description="Match the search term only at the start of each field"),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    include_total: bool = Query(False, description="Also return the number of matching products in X-Total-Count"),
+    prefetch: bool = Query(False, description="Start loading the next page in the background"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get all products with E-catalogue information (see /summary for a lean list)"""
+    params = _page_params(skip, limit, after, search, search_prefix)
+    params.update(
+        category_id=category_id or None,
+        supplier_id=supplier_id or None,
+        unit_id=unit_id or None,
+        stock_status=stock_status or None,
+        low_stock_only=False
+    )
+    return await _catalogue_page(db, params, include_total, prefetch)
 
-@router.get("/e-catalogue/", response_model=List[ECatalogueProduct])
+@router.get("/e-catalogue/", response_class=ORJSONResponse, responses={200: {"model": List[ECatalogueProduct]}})
 async def get_e_catalogue(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    category_id: Optional[str] = Query(None),
-    supplier_id: Optional[str] = Query(None),
-    unit_id: Optional[str] = Query(None),
+    category_id: Optional[UUID] = Query(None),
+    supplier_id: Optional[UUID] = Query(None),
+    unit_id: Optional[UUID] = Query(None),
     stock_status: Optional[str] = Query(None, regex="^(LOW_STOCK|REORDER_NEEDED|OVERSTOCK|NORMAL)$"),
     low_stock_only: bool = Query(False, description="Show only products with low stock"),
     search: Optional[str] = Query(None),
-    db: AsyncSessionWrapper = Depends(get_db),
+    search_prefix: bool = Query(False, description="Match the search term only at the start of each field"),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    include_total: bool = Query(False, description="Also return the number of matching products in X-Total-Count"),
+    prefetch: bool = Query(False, description="Start loading the next page in the background"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get E-catalogue view with all required fields and calculations"""
-    from sqlalchemy import text
-    
-    query = """
-        SELECT * FROM e_catalogue_view
-        WHERE is_active = true
+    params = _page_params(skip, limit, after, search, search_prefix)
+    params.update(
+        category_id=category_id or None,
+        supplier_id=supplier_id or None,
+        unit_id=unit_id or None,
+        stock_status=stock_status or None,
+        low_stock_only=low_stock_only
+    )
+    return await _catalogue_page(db, params, include_total, prefetch)
+
+@router.get("/summary", response_class=ORJSONResponse, responses={200: {"model": List[ProductSummary]}})
+async def get_product_summaries(
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    category_id: Optional[UUID] = Query(None, description="Filter by category ID"),
+    search: Optional[str] = Query(None, description="Search in name or code"),
+    search_prefix: bool = Query(False, description="Match the search term only at the start of each field"),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
     """
+    Get a lean product list with only id, name, code, standard cost and currency.
     
-    params = {"limit": limit, "skip": skip}
-    conditions = []
-    
-    if category_id:
-        conditions.append("category_id = :category_id")
-        params["category_id"] = category_id
-    
-    if supplier_id:
-        conditions.append("supplier_id = :supplier_id")
-        params["supplier_id"] = supplier_id
-    
-    if unit_id:
-        conditions.append("unit_id = :unit_id")
-        params["unit_id"] = unit_id
-        
-    if stock_status:
-        conditions.append("stock_status = :stock_status")
-        params["stock_status"] = stock_status
-    
-    if low_stock_only:
-        conditions.append("stock_status IN ('LOW_STOCK', 'REORDER_NEEDED')")
-        
-    if search:
-        conditions.append("(name ILIKE :search OR code ILIKE :search OR description ILIKE :search)")
-        params["search"] = f"%{search}%"
-    
-    if conditions:
-        query += " AND " + " AND ".join(conditions)
-    
-    query += " ORDER BY name LIMIT :limit OFFSET :skip"
-    
-    result = await db.execute(text(query), params)
-    
-    catalogue = []
-    for row in result:
-        catalogue.append({
-            "id": str(row.id),
-            "name": row.name,
-            "code": row.code,
-            "description": row.description,
-            "category_name": row.category_name,
-            "unit_of_measure": row.unit_of_measure,
-            "effective_unit_price": float(row.effective_unit_price) if row.effective_unit_price else None,
-            "contract_price": float(row.contract_price) if row.contract_price else None,
-            "standard_cost": float(row.standard_cost) if row.standard_cost else None,
-            "currency": row.currency,
-            "current_stock_quantity": float(row.current_stock_quantity),
-            "minimum_stock_level": row.minimum_stock_level,
-            "maximum_stock_level": row.maximum_stock_level,
-            "reorder_point": row.reorder_point,
-            "estimated_consumption_rate_per_day": float(row.estimated_consumption_rate_per_day),
-            "estimated_days_stock_will_last": float(row.estimated_days_stock_will_last) if row.estimated_days_stock_will_last else None,
-            "stock_status": row.stock_status,
-            "supplier_name": row.supplier_name,
-            "unit_name": row.unit_name,
-            "specifications": row.specifications,
-            "is_active": row.is_active,
-            "last_restocked_date": row.last_restocked_date.isoformat() if row.last_restocked_date else None,
-            "created_at": row.created_at.isoformat() if row.created_at else None,
-            "updated_at": row.updated_at.isoformat() if row.updated_at else None
-        })
-    
-    return catalogue
+    Prefer this over the full product list when the stock and pricing details
+    are not needed (pickers, dropdowns); it reads the products table alone.
+    """
+    params = _page_params(skip, limit, after, search, search_prefix)
+    params.update(category_id=category_id or None)
+    result = await db.execute(_SUMMARY_PAGE, params)
+    return name_page_response([dict(row) for row in result.mappings()], limit)
 
-@router.get("/categories/", response_model=List[ProductCategory])
+@router.get("/categories/", response_class=ORJSONResponse, responses={200: {"model": List[ProductCategory]}})
 async def get_product_categories(
-    db: AsyncSessionWrapper = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all product categories"""
-    from sqlalchemy import text
+    categories = _categories_cache.get("active")
+    if categories is not None:
+        return ORJSONResponse(categories)
     
-    result = await db.execute(text("""
-        SELECT id, name, code, description, parent_category_id, is_active,
-               created_at, updated_at
-        FROM product_categories 
-        WHERE is_active = true
-        ORDER BY name
-    """))
-    
-    categories = []
-    for row in result:
-        categories.append({
-            "id": str(row.id),
-            "name": row.name,
-            "code": row.code,
-            "description": row.description,
-            "parent_category_id": str(row.parent_category_id) if row.parent_category_id else None,
-            "is_active": row.is_active,
-            "created_at": row.created_at.isoformat() if row.created_at else None,
-            "updated_at": row.updated_at.isoformat() if row.updated_at else None
-        })
+    async def fetch_categories():
+        result = await db.execute(_CATEGORIES_QUERY)
+        
+        categories = [dict(mapping) for mapping in result.mappings()]
+        _categories_cache["active"] = categories
+        return categories
     
-    return categories
+    # Concurrent cache misses share a single query
+    return ORJSONResponse(await singleflight(CATEGORIES_CACHE, fetch_categories))
 
 @router.post("/categories/", response_model=ProductCategory, status_code=status.HTTP_201_CREATED)
 async def create_product_category(
     category: ProductCategoryCreate,
-    db: AsyncSessionWrapper = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_manager)
 ):
     """Create a new product category"""
-    if current_user.role not in ['manager', 'superuser']:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
-    
-    from sqlalchemy import text
-    import uuid
-    
-    new_id = str(uuid.uuid4())
+    new_id = uuid.uuid4()
     
-    await db.execute(text("""
-        INSERT INTO product_categories (id, name, code, description, parent_category_id, is_active)
-        VALUES (:id, :name, :code, :description, :parent_category_id, :is_active)
-    """), {
+    result = await db.execute(_INSERT_CATEGORY, {
         "id": new_id,
         "name": category.name,
         "code": category.code,
         "description": category.description,
-        "parent_category_id": str(category.parent_category_id) if category.parent_category_id else None,
+        "parent_category_id": category.parent_category_id,
         "is_active": category.is_active
     })
+    row = result.mappings().first()
     await db.commit()
+    clear_cache(CATEGORIES_CACHE)
+    clear_cache(CATALOGUE_PAGES_CACHE)
     
-    # Return the created category
-    result = await db.execute(text("""
-        SELECT id, name, code, description, parent_category_id, is_active, created_at, updated_at
-        FROM product_categories WHERE id = :id
-    """), {"id": new_id})
-    
-    row = result.first()
     return {
-        "id": str(row.id),
-        "name": row.name,
-        "code": row.code,
-        "description": row.description,
-        "parent_category_id": str(row.parent_category_id) if row.parent_category_id else None,
-        "is_active": row.is_active,
-        "created_at": row.created_at.isoformat() if row.created_at else None,
-        "updated_at": row.updated_at.isoformat() if row.updated_at else None
+        "id": str(row["id"]),
+        "name": row["name"],
+        "code": row["code"],
+        "description": row["description"],
+        "parent_category_id": str(row["parent_category_id"]) if row["parent_category_id"] else None,
+        "is_active": row["is_active"],
+        "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+        "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None
     }
 
-@router.get("/{product_id}", response_model=ECatalogueProduct)
-async def get_product(
-    product_id: UUID,
-    db: AsyncSessionWrapper = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Get a specific product by ID with all E-catalogue information"""
-    from sqlalchemy import text
-    
-    # Use the same e_catalogue_view pattern that works for other endpoints
-    result = await db.execute(text("""
-        SELECT * FROM e_catalogue_view
-        WHERE id = :product_id AND is_active = true
-    """), {"product_id": str(product_id)})
-    
-    row = result.first()
+async def _fetch_ecatalogue(db: AsyncSession, product_id: UUID):
+    """Load one active product row mapping from e_catalogue_view, or raise 404."""
+    result = await db.execute(
+        select(e_catalogue_view).where(
+            e_catalogue_view.c.id == product_id,
+            e_catalogue_view.c.is_active == true()
+        )
+    )
+    row = result.mappings().first()
     if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
-    
-    # Use the same mapping pattern as other endpoints
-    return {
-        "id": str(row.id),
-        "name": row.name,
-        "code": row.code,
-        "description": row.description,
-        "category_id": str(row.category_id) if row.category_id else None,
-        "category_name": row.category_name,
-        "category_code": row.category_code,
-        "unit_of_measure": row.unit_of_measure,
-        "standard_cost": float(row.standard_cost) if row.standard_cost else None,
-        "contract_price": float(row.contract_price) if row.contract_price else None,
-        "effective_unit_price": float(row.effective_unit_price) if row.effective_unit_price else None,
-        "currency": row.currency,
-        "current_stock_quantity": float(row.current_stock_quantity) if row.current_stock_quantity else 0,
-        "minimum_stock_level": row.minimum_stock_level,
-        "maximum_stock_level": row.maximum_stock_level,
-        "reorder_point": row.reorder_point,
-        "estimated_consumption_rate_per_day": float(row.estimated_consumption_rate_per_day) if row.estimated_consumption_rate_per_day else 0,
-        "estimated_days_stock_will_last": float(row.estimated_days_stock_will_last) if row.estimated_days_stock_will_last else None,
-        "stock_status": row.stock_status,
-        "supplier_id": str(row.supplier_id) if row.supplier_id else None,
-        "supplier_name": row.supplier_name,
-        "supplier_code": row.supplier_code,
-        "unit_id": str(row.unit_id) if row.unit_id else None,
-        "unit_name": row.unit_name,
-        "unit_code": row.unit_code,
-        "specifications": row.specifications,
-        "is_active": row.is_active,
-        "last_restocked_date": row.last_restocked_date.isoformat() if row.last_restocked_date else None,
-        "last_consumption_update": row.last_consumption_update.isoformat() if row.last_consumption_update else None,
-        "created_at": row.created_at.isoformat() if row.created_at else None,
-        "updated_at": row.updated_at.isoformat() if row.updated_at else None
-    }
+    return row
 
-@router.post("/", response_model=ECatalogueProduct, status_code=status.HTTP_201_CREATED)
-async def create_product(
-    product: ProductCreate,
-    db: AsyncSessionWrapper = Depends(get_db),
+async def _commit_changed_row(db: AsyncSession, result) -> dict:
+    """Commit a write whose result came from _ECATALOGUE_FROM_CHANGED and return it."""
+    row = result.mappings().first()
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+    await db.commit()
+    clear_cache(CATALOGUE_PAGES_CACHE)
+    return _row_to_ecatalogue(row)
+
+@router.get("/{product_id}", response_model=ECatalogueProduct)
+async def get_product(
+    product_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Create a new product with all E-catalogue fields"""
-    # Check if user has permission (only managers and superusers)
-    if current_user.role not in ['manager', 'superuser']:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
+    """Get a specific product by ID with all E-catalogue information"""
+    if request.headers.get("if-none-match"):
+        # Revalidation only needs the version, not the joined catalogue row
+        products = ProductModel.__table__.c
+        updated_at = await db.scalar(
+            select(products.updated_at).where(
+                products.id == product_id,
+                products.is_active == true()
+            )
         )
-    
-    from sqlalchemy import text
-    import uuid
-    
-    new_id = str(uuid.uuid4())
-    
-    # Validate that all mandatory E-catalogue fields are provided
-    if not all([
+        etag = etag_for(updated_at, product_id)
+        if is_not_modified(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    # Identical concurrent lookups share a single query
+    row = await singleflight(("product", product_id), lambda: _fetch_ecatalogue(db, product_id))
+    
+    # Same payload as the create/update/stock endpoints return for this product
+    response = ORJSONResponse(_row_to_ecatalogue(row))
+    etag = etag_for(row["updated_at"], product_id)
+    if etag:
+        response.headers["ETag"] = etag
+    return response
+
+BULK_LIMIT = 1000
+
+MANDATORY_FIELDS_DETAIL = "All E-catalogue mandatory fields must be provided: name, code, unit_of_measure, minimum_stock_level, maximum_stock_level, estimated_consumption_rate_per_day"
+
+def _has_mandatory_fields(product: ProductCreate) -> bool:
+    """Whether a new product carries every mandatory E-catalogue field"""
+    return all([
         product.name, product.code, product.unit_of_measure,
         product.minimum_stock_level is not None,
         product.maximum_stock_level is not None, 
         product.estimated_consumption_rate_per_day is not None
-    ]):
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="All E-catalogue mandatory fields must be provided: name, code, unit_of_measure, minimum_stock_level, maximum_stock_level, estimated_consumption_rate_per_day"
-        )
-    
-    await db.execute(text("""
-        INSERT INTO products (
-            id, name, code, description, category_id, unit_of_measure,
-            standard_cost, contract_price, currency, 
-            current_stock_quantity, minimum_stock_level, maximum_stock_level,
-            reorder_point, estimated_consumption_rate_per_day,
-            supplier_id, unit_id, specifications, is_active
-        )
-        VALUES (
-            :id, :name, :code, :description, :category_id, :unit_of_measure,
-            :standard_cost, :contract_price, :currency,
-            :current_stock_quantity, :minimum_stock_level, :maximum_stock_level,
-            :reorder_point, :estimated_consumption_rate_per_day,
-            :supplier_id, :unit_id, :specifications, :is_active
-        )
-    """), {
+    ])
+
+def _product_insert_params(product: ProductCreate, new_id: UUID) -> dict:
+    """Bind parameters for _INSERT_PRODUCT; UUIDs are passed to asyncpg as-is"""
+    return {
         "id": new_id,
         "name": product.name,
         "code": product.code,
         "description": product.description,
-        "category_id": str(product.category_id) if product.category_id else None,
+        "category_id": product.category_id,
         "unit_of_measure": product.unit_of_measure,
         "standard_cost": product.standard_cost,
         "contract_price": product.contract_price,
@@ -379,177 +601,193 @@ async def create_product(
         "maximum_stock_level": product.maximum_stock_level,
         "reorder_point": product.reorder_point,
         "estimated_consumption_rate_per_day": product.estimated_consumption_rate_per_day,
-        "supplier_id": str(product.supplier_id) if product.supplier_id else None,
-        "unit_id": str(product.unit_id) if product.unit_id else None,
+        "supplier_id": product.supplier_id,
+        "unit_id": product.unit_id,
         "specifications": product.specifications,
         "is_active": product.is_active
+    }
+
+@router.post("/", response_model=ECatalogueProduct, status_code=status.HTTP_201_CREATED)
+async def create_product(
+    product: ProductCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_manager)
+):
+    """Create a new product with all E-catalogue fields"""
+    new_id = uuid.uuid4()
+    
+    # Validate that all mandatory E-catalogue fields are provided
+    if not _has_mandatory_fields(product):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=MANDATORY_FIELDS_DETAIL
+        )
+    
+    # Insert and read back the enriched row in a single round-trip
+    result = await db.execute(_CREATE_PRODUCT, _product_insert_params(product, new_id))
+    return await _commit_changed_row(db, result)
+
+@router.post("/bulk", status_code=status.HTTP_201_CREATED)
+async def create_products_bulk(
+    products: List[ProductCreate],
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_manager)
+):
+    """Create many products in one statement batch (e.g. a catalogue import)"""
+    if not products:
+        raise HTTPException(status_code=400, detail="No products provided")
+    if len(products) > BULK_LIMIT:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {BULK_LIMIT} products can be created per request"
+        )
+
+    # Apply the single-product checks to every item before anything is written
+    seen_codes = {}
+    for index, product in enumerate(products):
+        if not _has_mandatory_fields(product):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Product {index}: {MANDATORY_FIELDS_DETAIL}"
+            )
+        if product.code in seen_codes:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Product {index}: code '{product.code}' is already used by product {seen_codes[product.code]}"
+            )
+        seen_codes[product.code] = index
+
+    ids = [uuid.uuid4() for _ in products]
+    try:
+        # A list of parameter sets runs as a single executemany on the driver
+        await db.execute(_INSERT_PRODUCT_ROW, [
+            _product_insert_params(product, new_id)
+            for product, new_id in zip(products, ids)
+        ])
+    except IntegrityError as e:
+        # The batch is all-or-nothing; name the conflicting row the database reported
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Products not created: {e.orig}"
+        )
+    await db.commit()
+    clear_cache(CATALOGUE_PAGES_CACHE)
+    return {"created": len(ids), "ids": ids}
+
+@router.patch("/bulk/stock")
+async def update_products_stock_bulk(
+    updates: List[BulkStockUpdate],
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_stock_manager)
+):
+    """Update stock levels for many products at once (e.g. a nightly stock count)"""
+    if not updates:
+        raise HTTPException(status_code=400, detail="No stock updates provided")
+    if len(updates) > BULK_LIMIT:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {BULK_LIMIT} products can be updated per request"
+        )
+    
+    now = datetime.now()
+    result = await db.execute(_BULK_SET_STOCK, {
+        "product_ids": [update.product_id for update in updates],
+        "quantities": [update.current_stock_quantity for update in updates],
+        "restock_dates": [update.last_restocked_date or now for update in updates]
     })
+    updated = {str(product_id) for product_id in result.scalars()}
     await db.commit()
+    clear_cache(CATALOGUE_PAGES_CACHE)
     
-    # Return the created product
-    return await get_product(UUID(new_id), db, current_user)
+    return {
+        "updated": len(updated),
+        "not_found": [str(update.product_id) for update in updates if str(update.product_id) not in updated]
+    }
 
 @router.put("/{product_id}", response_model=ECatalogueProduct)
 async def update_product(
     product_id: UUID,
     product: ProductUpdate,
-    db: AsyncSessionWrapper = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_manager)
 ):
     """Update a product"""
-    if current_user.role not in ['manager', 'superuser']:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
-    
-    from sqlalchemy import text
-    
-    # Check if product exists
-    check_result = await db.execute(text("SELECT id FROM products WHERE id = :product_id"), 
-                             {"product_id": str(product_id)})
-    if not check_result.first():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Product not found"
-        )
-    
     # Build update query dynamically
     update_fields = []
-    params = {"product_id": str(product_id)}
-    
-    for field, value in product.dict(exclude_unset=True).items():
-        if field in ['category_id', 'supplier_id', 'unit_id'] and value:
-            update_fields.append(f"{field} = :{field}")
-            params[field] = str(value)
-        elif field == 'specifications':
-            update_fields.append(f"{field} = :{field}")
-            params[field] = value
-        elif value is not None:
-            update_fields.append(f"{field} = :{field}")
-            params[field] = value
-    
-    if update_fields:
-        update_fields.append("updated_at = CURRENT_TIMESTAMP")
-        query = f"UPDATE products SET {', '.join(update_fields)} WHERE id = :product_id"
-        await db.execute(text(query), params)
-        await db.commit()
-    
-    return await get_product(product_id, db, current_user)
+    params = {"product_id": product_id}
+    
+    # Read only the fields the client sent instead of dumping the whole model;
+    # sorted so the same set of fields always produces the same SQL text
+    for field in sorted(product.model_fields_set):
+        value = getattr(product, field)
+        if value is None and field != 'specifications':
+            continue
+        update_fields.append(f"{field} = :{field}")
+        params[field] = value
+    
+    if not update_fields:
+        return _row_to_ecatalogue(await _fetch_ecatalogue(db, product_id))
+    
+    update_fields.append("updated_at = CURRENT_TIMESTAMP")
+    query = f"""
+        WITH changed AS (
+            UPDATE products SET {', '.join(update_fields)}
+            WHERE id = :product_id AND is_active = true
+            RETURNING *
+        )
+    """ + _ECATALOGUE_FROM_CHANGED
+    result = await db.execute(text(query), params)
+    return await _commit_changed_row(db, result)
 
 @router.patch("/{product_id}/stock", response_model=ECatalogueProduct)
 async def update_product_stock(
     product_id: UUID,
     stock_update: StockUpdate,
-    db: AsyncSessionWrapper = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_stock_manager)
 ):
     """Update product stock levels"""
-    if current_user.role not in ['manager', 'superuser', 'store_manager']:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
-    
-    from sqlalchemy import text
-    
-    # Check if product exists
-    check_result = await db.execute(text("SELECT id FROM products WHERE id = :product_id"), 
-                             {"product_id": str(product_id)})
-    if not check_result.first():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Product not found"
-        )
-    
     restock_date = stock_update.last_restocked_date or datetime.now()
     
-    await db.execute(text("""
-        UPDATE products 
-        SET current_stock_quantity = :quantity,
-            last_restocked_date = :restock_date,
-            updated_at = CURRENT_TIMESTAMP
-        WHERE id = :product_id
-    """), {
-        "product_id": str(product_id),
+    result = await db.execute(_SET_STOCK, {
+        "product_id": product_id,
         "quantity": stock_update.current_stock_quantity,
         "restock_date": restock_date
     })
-    await db.commit()
-    
-    return await get_product(product_id, db, current_user)
+    return await _commit_changed_row(db, result)
 
 @router.patch("/{product_id}/consumption", response_model=ECatalogueProduct)
 async def update_consumption_rate(
     product_id: UUID,
     consumption_update: ConsumptionRateUpdate,
-    db: AsyncSessionWrapper = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_stock_manager)
 ):
     """Update product consumption rate"""
-    if current_user.role not in ['manager', 'superuser', 'store_manager']:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
-    
-    from sqlalchemy import text
-    
-    # Check if product exists
-    check_result = await db.execute(text("SELECT id FROM products WHERE id = :product_id"), 
-                             {"product_id": str(product_id)})
-    if not check_result.first():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Product not found"
-        )
-    
     update_date = consumption_update.last_consumption_update or datetime.now()
     
-    await db.execute(text("""
-        UPDATE products 
-        SET estimated_consumption_rate_per_day = :rate,
-            last_consumption_update = :update_date,
-            updated_at = CURRENT_TIMESTAMP
-        WHERE id = :product_id
-    """), {
-        "product_id": str(product_id),
+    result = await db.execute(_SET_CONSUMPTION_RATE, {
+        "product_id": product_id,
         "rate": consumption_update.estimated_consumption_rate_per_day,
         "update_date": update_date
     })
-    await db.commit()
-    
-    return await get_product(product_id, db, current_user)
+    return await _commit_changed_row(db, result)
 
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_product(
     product_id: UUID,
-    db: AsyncSessionWrapper = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_manager)
 ):
     """Soft delete a product (set is_active to false)"""
-    if current_user.role not in ['manager', 'superuser']:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
-    
-    from sqlalchemy import text
-    
-    # Check if product exists
-    check_result = await db.execute(text("SELECT id FROM products WHERE id = :product_id AND is_active = true"), 
-                             {"product_id": str(product_id)})
-    if not check_result.first():
+    result = await db.execute(_DEACTIVATE_PRODUCT, {"product_id": product_id})
+    if result.first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
-    
-    await db.execute(text("""
-        UPDATE products 
-        SET is_active = false, updated_at = CURRENT_TIMESTAMP
-        WHERE id = :product_id
-    """), {"product_id": str(product_id)})
     await db.commit()
+    clear_cache(CATALOGUE_PAGES_CACHE)
     
     return None
@@ -1,256 +1,360 @@
 """
 Purchase Requisitions API endpoints for the Hotel Procurement System
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import logging
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.cache import get_cache, singleflight
+from app.core.database import ReadOnlyAsyncSessionLocal, get_ro_db
+from app.core.pagination import NEXT_CURSOR_HEADER, STREAM_THRESHOLD, decode_cursor, encode_cursor
+from app.core.responses import ORJSONResponse, content_etag, dumps, is_not_modified, iter_json_array
 from app.core.security import get_current_user
 from app.models.user import User
 from app.schemas.requisition import PurchaseRequisition, PurchaseRequisitionCreate, PurchaseRequisitionUpdate
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
-@router.get("/", response_model=List[PurchaseRequisition])
+# Upper bounds for one list request; larger listings have to page with ?after=
+MAX_PAGE_SIZE = 500
+MAX_SKIP = 100_000
+
+# Dashboards are polled far more often than requisitions change; keep each
+# unit's encoded stats and their ETag (or "all" for unscoped users) for a
+# short window
+DASHBOARD_CACHE = "requisition_dashboard"
+_dashboard_cache = get_cache(DASHBOARD_CACHE, ttl=45)
+
+# Browsers may reuse a dashboard response this long before revalidating
+DASHBOARD_CACHE_CONTROL = "private, max-age=30"
+
+def _decode_created_cursor(after: str) -> Tuple[datetime, UUID]:
+    """Decode a (created_at, id) keyset cursor, rejecting malformed input with a 400."""
+    try:
+        after_created_at, after_id = decode_cursor(after)
+        return datetime.fromisoformat(after_created_at), UUID(after_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+# Bind UUID and timestamp parameters with their native types so asyncpg
+# encodes them directly, without a str() in Python and a text -> uuid parse
+# in Postgres
+def _uuid_param(name: str):
+    return bindparam(name, type_=PG_UUID(as_uuid=True))
+
+# Declares who is asking for the rest of the transaction. The row-level
+# security policy on purchase_requisitions (sql_setup/14, 17) then limits
+# non-superusers to their own unit, so the queries carry no role branches.
+# A transaction that never declares a role sees no requisitions at all.
+_SET_UNIT_SCOPE = text("""
+    SELECT set_config('app.role', :role, true),
+           set_config('app.unit_id', COALESCE(CAST(:unit_id AS text), ''), true)
+""").bindparams(_uuid_param("unit_id"))
+
+async def set_unit_scope(db: Union[AsyncSession, AsyncConnection], user: User) -> None:
+    """Scope the session's (or connection's) current transaction to what user may see."""
+    await db.execute(_SET_UNIT_SCOPE, {"role": user.role, "unit_id": user.unit_id})
+
+async def set_system_scope(db: Union[AsyncSession, AsyncConnection]) -> None:
+    """
+    Let the current transaction see every unit's requisitions.
+    
+    Only for system-wide figures the caller has already decided the user may
+    see, such as the admin pages and the unscoped dashboard.
+    """
+    await db.execute(_SET_UNIT_SCOPE, {"role": "superuser", "unit_id": None})
+
+async def _get_unit_scoped_db(
+    db: AsyncSession = Depends(get_ro_db),
+    current_user: User = Depends(get_current_user)
+) -> AsyncSession:
+    """Read-only session already scoped to the current user's unit."""
+    await set_unit_scope(db, current_user)
+    return db
+
+# The list statement has one fixed shape: unused filters are bound to NULL
+# instead of being left out, so asyncpg reuses a single prepared statement
+# (and Postgres its plan) for every filter combination.
+_REQUISITION_WHERE = """
+    WHERE (CAST(:status_filter AS varchar) IS NULL OR pr.status = :status_filter)
+      AND (:unit_id IS NULL OR pr.unit_id = :unit_id)
+      AND (:after_created_at IS NULL
+           OR (pr.created_at, pr.id) < (:after_created_at, :after_id))
+"""
+
+_REQUISITION_LIST_PARAMS = (
+    _uuid_param("unit_id"), _uuid_param("after_id"),
+    bindparam("after_created_at", type_=DateTime(timezone=True))
+)
+
+_REQUISITION_PAGE_SQL = """
+    SELECT pr.id, pr.requisition_number, pr.title, pr.description, pr.department,
+           pr.requested_by, pr.unit_id, pr.priority, pr.status, pr.requested_date,
+           pr.required_date, COALESCE(pr.total_estimated_amount, 0)::float8 as total_estimated_amount,
+           pr.currency, pr.approval_notes,
+           pr.approved_by, pr.approved_at, pr.created_at, pr.updated_at,
+           u.full_name as requester_name,
+           u.email as requester_email,
+           unt.name as unit_name,
+           app.full_name as approver_name
+    FROM purchase_requisitions pr
+    LEFT JOIN users u ON pr.requested_by = u.id
+    LEFT JOIN users app ON pr.approved_by = app.id
+    LEFT JOIN units unt ON pr.unit_id = unt.id
+""" + _REQUISITION_WHERE + """
+    ORDER BY pr.created_at DESC, pr.id DESC
+    LIMIT :limit OFFSET :skip
+"""
+
+_REQUISITION_PAGE = text(_REQUISITION_PAGE_SQL).bindparams(*_REQUISITION_LIST_PARAMS)
+
+# The same page rendered by Postgres as the finished JSON array, together
+# with the row count and last sort key that the cursor header needs. The body
+# is returned as is, with no per-row work in Python.
+_REQUISITION_PAGE_JSON = text("""
+    SELECT COALESCE(json_agg(page ORDER BY page.created_at DESC, page.id DESC), '[]'::json)::text AS payload,
+           COUNT(*) AS row_count,
+           MIN(page.created_at) AS last_created_at,
+           (array_agg(page.id ORDER BY page.created_at, page.id))[1] AS last_id
+    FROM (""" + _REQUISITION_PAGE_SQL + """) page
+""").bindparams(*_REQUISITION_LIST_PARAMS)
+
+# Sort key of the last row on a page, for the cursor header of a streamed page
+_REQUISITION_PAGE_END = text("""
+    SELECT pr.created_at, pr.id
+    FROM purchase_requisitions pr
+""" + _REQUISITION_WHERE + """
+    ORDER BY pr.created_at DESC, pr.id DESC
+    LIMIT 1 OFFSET :last_offset
+""").bindparams(*_REQUISITION_LIST_PARAMS)
+
+async def _stream_requisition_rows(params: dict, user: User) -> AsyncIterator[dict]:
+    """
+    Yield _REQUISITION_PAGE rows from a server-side cursor.
+    
+    The body is sent after the handler returns, so the cursor runs on its own
+    session rather than the request's, scoped to the same user.
+    """
+    async with ReadOnlyAsyncSessionLocal() as db:
+        await set_unit_scope(db, user)
+        result = await db.stream(_REQUISITION_PAGE, params)
+        async for row in result.mappings():
+            yield dict(row)
+
+async def _streamed_requisition_page(db: AsyncSession, params: dict, user: User) -> StreamingResponse:
+    """Stream a large requisition page, resolving its cursor header before the body starts."""
+    params = dict(params, last_offset=params["skip"] + params["limit"] - 1)
+    last = (await db.execute(_REQUISITION_PAGE_END, params)).first()
+    
+    response = StreamingResponse(
+        iter_json_array(_stream_requisition_rows(params, user)), media_type="application/json"
+    )
+    if last is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at.isoformat(), last.id)
+    return response
+
+@router.get("/", response_class=ORJSONResponse, responses={200: {"model": List[PurchaseRequisition]}})
 async def get_purchase_requisitions(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0, le=MAX_SKIP),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
     status_filter: Optional[str] = None,
-    unit_id: Optional[str] = None,
-    db: Session = Depends(get_db),
+    unit_id: Optional[UUID] = None,
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(_get_unit_scoped_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all purchase requisitions"""
-    from sqlalchemy import text
-    
-    base_query = """
-        SELECT pr.id, pr.requisition_number, pr.title, pr.description, pr.department,
-               pr.requested_by, pr.unit_id, pr.priority, pr.status, pr.requested_date,
-               pr.required_date, pr.total_estimated_amount, pr.currency, pr.approval_notes,
-               pr.approved_by, pr.approved_at, pr.created_at, pr.updated_at,
-               u.first_name || ' ' || u.last_name as requester_name,
-               u.email as requester_email,
-               unt.name as unit_name,
-               app.first_name || ' ' || app.last_name as approver_name
-        FROM purchase_requisitions pr
-        LEFT JOIN users u ON pr.requested_by = u.id
-        LEFT JOIN users app ON pr.approved_by = app.id
-        LEFT JOIN units unt ON pr.unit_id = unt.id
-        WHERE 1=1
     """
+    Get all purchase requisitions, newest first.
     
-    params = {"limit": limit, "skip": skip}
-    
-    if status_filter:
-        base_query += " AND pr.status = :status_filter"
-        params["status_filter"] = status_filter
-    
-    if unit_id:
-        base_query += " AND pr.unit_id = :unit_id"
-        params["unit_id"] = unit_id
-    
-    # Filter by user's unit if not superuser
-    if current_user.role not in ['superuser']:
-        base_query += " AND pr.unit_id = :user_unit_id"
-        params["user_unit_id"] = str(current_user.unit_id) if current_user.unit_id else None
+    Pass the previous page's X-Next-Cursor header as ?after= to continue from
+    it; that seeks straight to the next row instead of skipping past OFFSET rows.
+    """
+    if limit == MAX_PAGE_SIZE:
+        # Clients asking for the largest page are likely walking the whole table
+        logger.warning("Requisition list requested at the page size cap (limit=%d) by user %s", limit, current_user.id)
     
-    base_query += " ORDER BY pr.created_at DESC LIMIT :limit OFFSET :skip"
+    after_created_at, after_id = _decode_created_cursor(after) if after else (None, None)
     
-    result = db.execute(text(base_query), params)
+    params = {
+        "limit": limit,
+        "skip": skip,
+        "status_filter": status_filter or None,
+        "unit_id": unit_id,
+        "after_created_at": after_created_at,
+        "after_id": after_id
+    }
+    if limit > STREAM_THRESHOLD:
+        return await _streamed_requisition_page(db, params, current_user)
     
-    requisitions = []
-    for row in result:
-        requisitions.append({
-            "id": str(row.id),
-            "requisition_number": row.requisition_number,
-            "title": row.title,
-            "description": row.description,
-            "department": row.department,
-            "requested_by": str(row.requested_by),
-            "requester_name": row.requester_name,
-            "requester_email": row.requester_email,
-            "unit_id": str(row.unit_id),
-            "unit_name": row.unit_name,
-            "priority": row.priority,
-            "status": row.status,
-            "requested_date": row.requested_date.isoformat() if row.requested_date else None,
-            "required_date": row.required_date.isoformat() if row.required_date else None,
-            "total_estimated_amount": float(row.total_estimated_amount) if row.total_estimated_amount else 0.0,
-            "currency": row.currency,
-            "approval_notes": row.approval_notes,
-            "approved_by": str(row.approved_by) if row.approved_by else None,
-            "approver_name": row.approver_name,
-            "approved_at": row.approved_at.isoformat() if row.approved_at else None,
-            "created_at": row.created_at.isoformat() if row.created_at else None,
-            "updated_at": row.updated_at.isoformat() if row.updated_at else None
-        })
+    page = (await db.execute(_REQUISITION_PAGE_JSON, params)).mappings().one()
     
-    return requisitions
+    response = Response(page["payload"], media_type="application/json")
+    if page["row_count"] == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(page["last_created_at"].isoformat(), page["last_id"])
+    return response
 
-@router.get("/{requisition_id}", response_model=PurchaseRequisition)
-async def get_purchase_requisition(
-    requisition_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Get a specific purchase requisition by ID"""
-    from sqlalchemy import text
-    
-    result = db.execute(text("""
+# Requisition header plus its items as one JSON object, rendered by Postgres
+# and built once at import like the other statements
+_REQUISITION_DETAIL = text("""
+    SELECT row_to_json(detail)::text AS payload
+    FROM (
         SELECT pr.id, pr.requisition_number, pr.title, pr.description, pr.department,
                pr.requested_by, pr.unit_id, pr.priority, pr.status, pr.requested_date,
-               pr.required_date, pr.total_estimated_amount, pr.currency, pr.approval_notes,
+               pr.required_date, COALESCE(pr.total_estimated_amount, 0)::float8 as total_estimated_amount,
+               pr.currency, pr.approval_notes,
                pr.approved_by, pr.approved_at, pr.created_at, pr.updated_at,
-               u.first_name || ' ' || u.last_name as requester_name,
+               u.full_name as requester_name,
                u.email as requester_email,
                unt.name as unit_name,
-               app.first_name || ' ' || app.last_name as approver_name
+               app.full_name as approver_name,
+               -- Items come back in the same round-trip as a JSON array
+               COALESCE((
+                   SELECT json_agg(json_build_object(
+                       'id', pri.id,
+                       'product_id', pri.product_id,
+                       'product_name', pri.product_name,
+                       'product_description', pri.product_description,
+                       'product_catalog_name', p.name,
+                       'product_code', p.code,
+                       'quantity', pri.quantity,
+                       'unit_of_measure', pri.unit_of_measure,
+                       'estimated_unit_price', pri.estimated_unit_price,
+                       'estimated_total_price', pri.estimated_total_price,
+                       'currency', pri.currency,
+                       'specifications', pri.specifications,
+                       'notes', pri.notes
+                   ) ORDER BY pri.created_at)
+                   FROM purchase_requisition_items pri
+                   LEFT JOIN products p ON pri.product_id = p.id
+                   WHERE pri.requisition_id = pr.id
+               ), '[]'::json) as items
         FROM purchase_requisitions pr
         LEFT JOIN users u ON pr.requested_by = u.id
         LEFT JOIN users app ON pr.approved_by = app.id
         LEFT JOIN units unt ON pr.unit_id = unt.id
         WHERE pr.id = :requisition_id
-    """), {"requisition_id": str(requisition_id)})
+    ) detail
+""").bindparams(_uuid_param("requisition_id"))
+
+@router.get("/{requisition_id}", response_class=ORJSONResponse, responses={200: {"model": PurchaseRequisition}})
+async def get_purchase_requisition(
+    requisition_id: UUID,
+    db: AsyncSession = Depends(_get_unit_scoped_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a specific purchase requisition by ID"""
+    result = await db.execute(_REQUISITION_DETAIL, {"requisition_id": requisition_id})
     
-    row = result.first()
-    if not row:
+    # Requisitions of other units are hidden by the unit policy, so they are
+    # reported as not found
+    payload = result.scalar()
+    if payload is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Purchase requisition not found"
         )
     
-    # Check if user has access to this requisition
-    if current_user.role not in ['superuser'] and str(row.unit_id) != str(current_user.unit_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to access this requisition"
-        )
-    
-    # Get requisition items
-    items_result = db.execute(text("""
-        SELECT pri.id, pri.product_id, pri.product_name, pri.product_description,
-               pri.quantity, pri.unit_of_measure, pri.estimated_unit_price,
-               pri.estimated_total_price, pri.currency, pri.specifications, pri.notes,
-               p.name as product_catalog_name, p.code as product_code
-        FROM purchase_requisition_items pri
-        LEFT JOIN products p ON pri.product_id = p.id
-        WHERE pri.requisition_id = :requisition_id
-        ORDER BY pri.created_at
-    """), {"requisition_id": str(requisition_id)})
-    
-    items = []
-    for item_row in items_result:
-        items.append({
-            "id": str(item_row.id),
-            "product_id": str(item_row.product_id) if item_row.product_id else None,
-            "product_name": item_row.product_name,
-            "product_description": item_row.product_description,
-            "product_catalog_name": item_row.product_catalog_name,
-            "product_code": item_row.product_code,
-            "quantity": float(item_row.quantity),
-            "unit_of_measure": item_row.unit_of_measure,
-            "estimated_unit_price": float(item_row.estimated_unit_price) if item_row.estimated_unit_price else None,
-            "estimated_total_price": float(item_row.estimated_total_price) if item_row.estimated_total_price else None,
-            "currency": item_row.currency,
-            "specifications": item_row.specifications,
-            "notes": item_row.notes
-        })
+    return Response(payload, media_type="application/json")
+
+# All dashboard aggregates in one round-trip. The counts come from the
+# trigger-maintained requisition_status_counts table (sql_setup/13), so only
+# the six-month trend still reads purchase_requisitions itself. Keeping it a
+# single statement on one connection is cheaper than running the pieces
+# concurrently on several: the counter reads are tiny next to the trend, so
+# parallel sessions would only add checkouts and round-trips.
+_DASHBOARD_STATS = text("""
+    WITH counts AS (
+        SELECT status, priority, count
+        FROM requisition_status_counts
+        WHERE :unit_id IS NULL OR unit_id = :unit_id
+    ),
+    status_counts AS (
+        SELECT status, SUM(count) AS count
+        FROM counts
+        WHERE status <> ''
+        GROUP BY status
+        HAVING SUM(count) > 0
+    ),
+    monthly AS (
+        SELECT to_char(DATE_TRUNC('month', requested_date), 'YYYY-MM') AS month,
+               COUNT(*) AS count,
+               COALESCE(SUM(total_estimated_amount), 0)::float8 AS total_amount
+        FROM purchase_requisitions
+        WHERE (:unit_id IS NULL OR unit_id = :unit_id)
+        AND requested_date >= CURRENT_DATE - INTERVAL '6 months'
+        GROUP BY 1
+    )
+    SELECT
+        (SELECT COALESCE(SUM(count), 0)::bigint FROM counts) AS total_requisitions,
+        COALESCE((SELECT json_object_agg(status, count) FROM status_counts), '{}'::json) AS status_counts,
+        COALESCE((SELECT json_agg(monthly ORDER BY month) FROM monthly), '[]'::json) AS monthly_trends,
+        (
+            SELECT COALESCE(SUM(count), 0)::bigint FROM counts
+            WHERE priority IN ('urgent', 'high')
+            AND status NOT IN ('', 'completed', 'cancelled', 'rejected')
+        ) AS urgent_count
+""").bindparams(_uuid_param("unit_id"))
+
+async def _compute_dashboard_stats(db: AsyncSession, unit_id: Optional[UUID]) -> dict:
+    """Run the dashboard aggregates for one unit, or for every unit when unit_id is None."""
+    result = await db.execute(_DASHBOARD_STATS, {"unit_id": unit_id})
+    row = result.mappings().one()
+    status_counts = row["status_counts"]
     
-    requisition_data = {
-        "id": str(row.id),
-        "requisition_number": row.requisition_number,
-        "title": row.title,
-        "description": row.description,
-        "department": row.department,
-        "requested_by": str(row.requested_by),
-        "requester_name": row.requester_name,
-        "requester_email": row.requester_email,
-        "unit_id": str(row.unit_id),
-        "unit_name": row.unit_name,
-        "priority": row.priority,
-        "status": row.status,
-        "requested_date": row.requested_date.isoformat() if row.requested_date else None,
-        "required_date": row.required_date.isoformat() if row.required_date else None,
-        "total_estimated_amount": float(row.total_estimated_amount) if row.total_estimated_amount else 0.0,
-        "currency": row.currency,
-        "approval_notes": row.approval_notes,
-        "approved_by": str(row.approved_by) if row.approved_by else None,
-        "approver_name": row.approver_name,
-        "approved_at": row.approved_at.isoformat() if row.approved_at else None,
-        "created_at": row.created_at.isoformat() if row.created_at else None,
-        "updated_at": row.updated_at.isoformat() if row.updated_at else None,
-        "items": items
+    return {
+        "total_requisitions": row["total_requisitions"],
+        "status_counts": status_counts,
+        "urgent_count": row["urgent_count"],
+        "monthly_trends": row["monthly_trends"],
+        "pending_approval": status_counts.get('submitted', 0) + status_counts.get('under_review', 0)
     }
-    
-    return requisition_data
 
-@router.get("/stats/dashboard", response_model=dict)
+async def _encode_dashboard_stats(db: AsyncSession, unit_id: Optional[UUID]) -> Tuple[bytes, str]:
+    """Dashboard stats as a response body, with the ETag of that body."""
+    body = dumps(await _compute_dashboard_stats(db, unit_id))
+    return body, content_etag(body)
+
+@router.get("/stats/dashboard", response_class=ORJSONResponse)
 async def get_dashboard_stats(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_ro_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get dashboard statistics for purchase requisitions"""
-    from sqlalchemy import text
-    
+    """Get dashboard statistics for purchase requisitions (304 if the client's copy is current)"""
     # Base filter by unit if not superuser
-    unit_filter = ""
-    params = {}
+    unit_id = None
     if current_user.role not in ['superuser'] and current_user.unit_id:
-        unit_filter = "WHERE unit_id = :unit_id"
-        params["unit_id"] = str(current_user.unit_id)
-    
-    # Get status counts
-    status_result = db.execute(text(f"""
-        SELECT status, COUNT(*) as count
-        FROM purchase_requisitions
-        {unit_filter}
-        GROUP BY status
-    """), params)
-    
-    status_counts = {}
-    total_requisitions = 0
-    for row in status_result:
-        status_counts[row.status] = row.count
-        total_requisitions += row.count
-    
-    # Get monthly trends (last 6 months)
-    monthly_result = db.execute(text(f"""
-        SELECT 
-            DATE_TRUNC('month', requested_date) as month,
-            COUNT(*) as count,
-            SUM(total_estimated_amount) as total_amount
-        FROM purchase_requisitions
-        {unit_filter}
-        WHERE requested_date >= CURRENT_DATE - INTERVAL '6 months'
-        GROUP BY DATE_TRUNC('month', requested_date)
-        ORDER BY month
-    """), params)
-    
-    monthly_data = []
-    for row in monthly_result:
-        monthly_data.append({
-            "month": row.month.strftime("%Y-%m") if row.month else None,
-            "count": row.count,
-            "total_amount": float(row.total_amount) if row.total_amount else 0.0
-        })
+        unit_id = current_user.unit_id
     
-    # Get urgent/high priority count
-    urgent_result = db.execute(text(f"""
-        SELECT COUNT(*) as count
-        FROM purchase_requisitions
-        {unit_filter}
-        {"AND" if unit_filter else "WHERE"} priority IN ('urgent', 'high')
-        AND status NOT IN ('completed', 'cancelled', 'rejected')
-    """), params)
+    async def fetch() -> Tuple[bytes, str]:
+        # The monthly trend reads purchase_requisitions, so the unit policy
+        # must let it see the same units the counters are filtered to
+        if unit_id is None:
+            await set_system_scope(db)
+        else:
+            await set_unit_scope(db, current_user)
+        return await _encode_dashboard_stats(db, unit_id)
     
-    urgent_count = urgent_result.scalar() or 0
+    cache_key = unit_id or "all"
+    cached = _dashboard_cache.get(cache_key)
+    if cached is None:
+        # Concurrent polls of the same dashboard share a single query
+        cached = await singleflight((DASHBOARD_CACHE, cache_key), fetch)
+        _dashboard_cache[cache_key] = cached
+    body, etag = cached
     
-    return {
-        "total_requisitions": total_requisitions,
-        "status_counts": status_counts,
-        "urgent_count": urgent_count,
-        "monthly_trends": monthly_data,
-        "pending_approval": status_counts.get('submitted', 0) + status_counts.get('under_review', 0)
-    }
+    headers = {"ETag": etag, "Cache-Control": DASHBOARD_CACHE_CONTROL}
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
@@ -2,173 +2,362 @@
 Simple API endpoints for frontend integration
 Returns data directly from the Supabase database using SQL queries
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import create_engine, text
-from typing import List, Dict, Any
-import os
-from dotenv import load_dotenv
+from functools import lru_cache
 
-from app.core.security import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import RowMapping, String, TextClause, bindparam, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from typing import AsyncIterator, Dict, Any, Optional, Sequence, Tuple
+from uuid import UUID
+import uuid
+
+from app.api.products import CATEGORIES_CACHE
+from app.api.requisitions import set_system_scope, set_unit_scope
+from app.api.suppliers import SUPPLIERS_CACHE
+from app.api.units import UNITS_CACHE
+from app.core.cache import clear_cache, get_cache, singleflight
+from app.core.database import async_engine
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_name_cursor, name_page_response, next_name_cursor
+from app.core.responses import ORJSONResponse, content_etag, dumps, is_not_modified, iter_json_array
+from app.core.security import get_current_user, get_password_hash, invalidate_user_cache, verify_password
 from app.models.user import User
 
-load_dotenv()
+# Rows are returned as ORJSONResponse directly: orjson encodes the UUIDs,
+# datetimes and numerics the queries select as-is, so neither the SQL (::text
+# casts) nor FastAPI's jsonable_encoder has to convert them first
+router = APIRouter(default_response_class=ORJSONResponse)
 
-router = APIRouter()
+# Every statement below is a module-level text() built once at import; the
+# helpers take those TextClauses, so requests only bind parameters
+async def execute_query(
+    query: TextClause, params: dict = None, user: Optional[User] = None, system_wide: bool = False
+) -> Sequence[RowMapping]:
+    """
+    Execute a SQL query and return its rows as read-only mappings.
+    
+    Queries that read purchase_requisitions must pass the requesting user, or
+    system_wide=True for admin figures covering every unit: the table's
+    row-level security policy shows nothing to a transaction that has not
+    been scoped.
+    """
+    async with async_engine.connect() as conn:
+        if system_wide:
+            await set_system_scope(conn)
+        elif user is not None:
+            await set_unit_scope(conn, user)
+        result = await conn.execute(query, params or {})
+        return result.mappings().all()
 
-# Create database engine
-DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_engine(DATABASE_URL) if DATABASE_URL else None
+async def stream_query(query: TextClause, params: dict = None, user: Optional[User] = None) -> AsyncIterator[RowMapping]:
+    """
+    Yield a SQL query's rows from a server-side cursor as they arrive.
+    
+    Meant for response bodies, which are sent after the handler returns, so
+    the cursor runs on its own connection. user scopes it as in execute_query.
+    """
+    async with async_engine.connect() as conn:
+        if user is not None:
+            await set_unit_scope(conn, user)
+        result = await conn.stream(query, params or {})
+        async for row in result.mappings():
+            yield row
 
-def execute_query(query: str, params: dict = None) -> List[Dict[str, Any]]:
-    """Execute a SQL query and return results as list of dictionaries"""
-    if not engine:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database connection not available"
-        )
+async def execute_write(query: TextClause, params: dict = None) -> int:
+    """Execute a SQL write in its own transaction and return the affected row count"""
+    async with async_engine.begin() as conn:
+        result = await conn.execute(query, params or {})
+        return result.rowcount
+
+async def execute_write_returning(query: TextClause, params: dict = None) -> RowMapping:
+    """Execute a single-row SQL write ending in RETURNING and return that row"""
+    async with async_engine.begin() as conn:
+        result = await conn.execute(query, params or {})
+        return result.mappings().one()
+
+async def cached_page(namespace: str, query: TextClause, params: dict) -> Tuple[bytes, str, Optional[str]]:
+    """
+    One page of a reference list as an encoded JSON body, its ETag and the
+    next page's cursor, through the namespace's TTL cache.
     
-    with engine.connect() as conn:
-        result = conn.execute(text(query), params or {})
-        columns = result.keys()
-        rows = result.fetchall()
-        
-        return [dict(zip(columns, row)) for row in rows]
+    Only for read-mostly reference data: writers to the underlying table must
+    clear_cache(namespace).
+    """
+    cache = get_cache(namespace, ttl=60)
+    key = (query, tuple(sorted(params.items())))
+    cached = cache.get(key)
+    if cached is None:
+        async def fetch() -> Tuple[bytes, str, Optional[str]]:
+            rows = await execute_query(query, params)
+            body = dumps(rows)
+            return body, content_etag(body), next_name_cursor(rows, params["limit"])
+        
+        # Concurrent cache misses share a single query
+        cached = await singleflight((namespace, key), fetch)
+        cache[key] = cached
+    return cached
 
-@router.get("/units")
-async def get_units(current_user: User = Depends(get_current_user)):
-    """Get all hotel units"""
-    query = """
-        SELECT id::text, name, code, description, address, city, country, 
-               is_active, created_at, updated_at
-        FROM units 
-        WHERE is_active = true
-        ORDER BY name
+def conditional_json(request: Request, body: bytes, etag: str, next_cursor: Optional[str] = None) -> Response:
+    """Send body with its ETag, or an empty 304 if the client already has it"""
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    headers = {"ETag": etag}
+    if next_cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    return Response(body, media_type="application/json", headers=headers)
+
+# The reference lists are read in (name, id) order a page at a time; the next
+# page's cursor travels in the X-Next-Cursor header, as for /products/
+REFERENCE_PAGE_SIZE = 1000
+
+def _reference_page_params(limit: int, after: Optional[str]) -> dict:
+    """Bind values for one page of a reference list"""
+    after_name, after_id = decode_name_cursor(after) if after else (None, None)
+    return {"limit": limit, "after_name": after_name, "after_id": after_id}
+
+def _selected_columns(columns: Dict[str, str], fields: Optional[str]) -> Tuple[str, ...]:
     """
-    return execute_query(query)
+    The SQL expressions for the ?fields= a client asked for, in column order.
+    
+    Only names in columns are accepted, so the request can never put text of
+    its own into the SELECT list. id and name are always sent because the
+    next page's cursor is made from them.
+    """
+    if not fields:
+        return tuple(columns.values())
+    requested = {field.strip() for field in fields.split(",")} | {"id", "name"}
+    return tuple(expression for field, expression in columns.items() if field in requested)
+
+@lru_cache(maxsize=256)
+def _reference_page_query(sql: str, columns: Tuple[str, ...]) -> TextClause:
+    """Build a reference list's page statement for one column selection, once"""
+    return text(sql.format(columns=", ".join(columns))).bindparams(
+        bindparam("after_name", type_=String),
+        bindparam("after_id", type_=PG_UUID(as_uuid=True))
+    )
+
+# Whether products has a unit_id column (added by sql_setup/04); looked up
+# once on first use instead of failing a query to find out
+_products_unit_id_column = None
+
+_PRODUCTS_UNIT_ID_COLUMN_QUERY = text("""
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = current_schema()
+    AND table_name = 'products' AND column_name = 'unit_id'
+""")
+
+async def _products_have_unit_id() -> bool:
+    """Check, once per process, whether the products table has a unit_id column"""
+    global _products_unit_id_column
+    if _products_unit_id_column is None:
+        _products_unit_id_column = bool(await execute_query(_PRODUCTS_UNIT_ID_COLUMN_QUERY))
+    return _products_unit_id_column
+
+_UNIT_COLUMNS = {
+    field: field for field in (
+        "id", "name", "code", "description", "address", "city", "country",
+        "is_active", "created_at", "updated_at"
+    )
+}
+_UNITS_PAGE_SQL = """
+    SELECT {columns}
+    FROM units 
+    WHERE is_active = true
+    AND (:after_name IS NULL OR (name, id) > (:after_name, :after_id))
+    ORDER BY name, id
+    LIMIT :limit
+"""
+
+@router.get("/units")
+async def get_units(
+    request: Request,
+    limit: int = Query(REFERENCE_PAGE_SIZE, ge=1, le=REFERENCE_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    current_user: User = Depends(get_current_user)
+):
+    """Get all hotel units (304 if the client's copy is current)"""
+    query = _reference_page_query(_UNITS_PAGE_SQL, _selected_columns(_UNIT_COLUMNS, fields))
+    return conditional_json(request, *await cached_page(UNITS_CACHE, query, _reference_page_params(limit, after)))
+
+_SUPPLIER_COLUMNS = {
+    field: field for field in (
+        "id", "name", "code", "contact_person", "email", "phone", "address",
+        "city", "country", "payment_terms", "currency", "rating", "is_active",
+        "created_at", "updated_at"
+    )
+}
+_SUPPLIERS_PAGE_SQL = """
+    SELECT {columns}
+    FROM suppliers 
+    WHERE is_active = true
+    AND (:after_name IS NULL OR (name, id) > (:after_name, :after_id))
+    ORDER BY name, id
+    LIMIT :limit
+"""
 
 @router.get("/suppliers")
-async def get_suppliers(current_user: User = Depends(get_current_user)):
-    """Get all suppliers"""
-    query = """
-        SELECT id::text, name, code, contact_person, email, phone, address, 
-               city, country, payment_terms, currency, rating, is_active,
-               created_at, updated_at
-        FROM suppliers 
-        WHERE is_active = true
-        ORDER BY name
-    """
-    return execute_query(query)
+async def get_suppliers(
+    request: Request,
+    limit: int = Query(REFERENCE_PAGE_SIZE, ge=1, le=REFERENCE_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    current_user: User = Depends(get_current_user)
+):
+    """Get all suppliers (304 if the client's copy is current)"""
+    query = _reference_page_query(_SUPPLIERS_PAGE_SQL, _selected_columns(_SUPPLIER_COLUMNS, fields))
+    return conditional_json(request, *await cached_page(SUPPLIERS_CACHE, query, _reference_page_params(limit, after)))
+
+_PRODUCT_COLUMNS = {
+    **{field: f"p.{field}" for field in (
+        "id", "name", "code", "description", "category_id", "unit_of_measure",
+        "standard_cost", "currency", "minimum_stock_level", "maximum_stock_level",
+        "reorder_point", "is_active", "created_at", "updated_at"
+    )},
+    "category_name": "pc.name as category_name",
+    "category_code": "pc.code as category_code"
+}
+_PRODUCTS_PAGE_SQL = """
+    SELECT {columns}
+    FROM products p
+    LEFT JOIN product_categories pc ON p.category_id = pc.id
+    WHERE p.is_active = true
+    AND (:after_name IS NULL OR (p.name, p.id) > (:after_name, :after_id))
+    ORDER BY p.name, p.id
+    LIMIT :limit
+"""
 
 @router.get("/products")
-async def get_products(current_user: User = Depends(get_current_user)):
+async def get_products(
+    limit: int = Query(REFERENCE_PAGE_SIZE, ge=1, le=REFERENCE_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    current_user: User = Depends(get_current_user)
+):
     """Get all products with category information"""
-    query = """
-        SELECT p.id::text, p.name, p.code, p.description, 
-               p.category_id::text, p.unit_of_measure,
-               p.standard_cost, p.currency, p.minimum_stock_level, 
-               p.maximum_stock_level, p.reorder_point, p.is_active,
-               p.created_at, p.updated_at,
-               pc.name as category_name, pc.code as category_code
-        FROM products p
-        LEFT JOIN product_categories pc ON p.category_id = pc.id
-        WHERE p.is_active = true
-        ORDER BY p.name
-    """
-    return execute_query(query)
+    query = _reference_page_query(_PRODUCTS_PAGE_SQL, _selected_columns(_PRODUCT_COLUMNS, fields))
+    return name_page_response(await execute_query(query, _reference_page_params(limit, after)), limit)
+
+_PRODUCT_CATEGORY_COLUMNS = {
+    field: field for field in (
+        "id", "name", "code", "description", "parent_category_id",
+        "is_active", "created_at", "updated_at"
+    )
+}
+_PRODUCT_CATEGORIES_PAGE_SQL = """
+    SELECT {columns}
+    FROM product_categories 
+    WHERE is_active = true
+    AND (:after_name IS NULL OR (name, id) > (:after_name, :after_id))
+    ORDER BY name, id
+    LIMIT :limit
+"""
 
 @router.get("/product-categories")
-async def get_product_categories(current_user: User = Depends(get_current_user)):
-    """Get all product categories"""
-    query = """
-        SELECT id::text, name, code, description, parent_category_id::text, 
-               is_active, created_at, updated_at
-        FROM product_categories 
-        WHERE is_active = true
-        ORDER BY name
-    """
-    return execute_query(query)
+async def get_product_categories(
+    request: Request,
+    limit: int = Query(REFERENCE_PAGE_SIZE, ge=1, le=REFERENCE_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    current_user: User = Depends(get_current_user)
+):
+    """Get all product categories (304 if the client's copy is current)"""
+    query = _reference_page_query(_PRODUCT_CATEGORIES_PAGE_SQL, _selected_columns(_PRODUCT_CATEGORY_COLUMNS, fields))
+    return conditional_json(
+        request, *await cached_page(CATEGORIES_CACHE, query, _reference_page_params(limit, after))
+    )
+
+_PURCHASE_REQUISITIONS_QUERY = text("""
+    SELECT pr.id, pr.requisition_number, pr.title, pr.description, 
+           pr.department, pr.requested_by, pr.unit_id, 
+           pr.priority, pr.status, pr.requested_date, pr.required_date,
+           pr.total_estimated_amount, pr.currency, pr.approval_notes,
+           pr.approved_by, pr.approved_at, pr.created_at, pr.updated_at,
+           u.first_name || ' ' || u.last_name as requester_name,
+           u.email as requester_email,
+           unt.name as unit_name,
+           app.first_name || ' ' || app.last_name as approver_name
+    FROM purchase_requisitions pr
+    LEFT JOIN users u ON pr.requested_by = u.id
+    LEFT JOIN users app ON pr.approved_by = app.id
+    LEFT JOIN units unt ON pr.unit_id = unt.id
+    ORDER BY pr.created_at DESC
+    LIMIT 100
+""")
 
 @router.get("/purchase-requisitions")
 async def get_purchase_requisitions(current_user: User = Depends(get_current_user)):
     """Get all purchase requisitions"""
-    query = """
-        SELECT pr.id::text, pr.requisition_number, pr.title, pr.description, 
-               pr.department, pr.requested_by::text, pr.unit_id::text, 
-               pr.priority, pr.status, pr.requested_date, pr.required_date,
-               pr.total_estimated_amount, pr.currency, pr.approval_notes,
-               pr.approved_by::text, pr.approved_at, pr.created_at, pr.updated_at,
-               u.first_name || ' ' || u.last_name as requester_name,
-               u.email as requester_email,
-               unt.name as unit_name,
-               app.first_name || ' ' || app.last_name as approver_name
-        FROM purchase_requisitions pr
-        LEFT JOIN users u ON pr.requested_by = u.id
-        LEFT JOIN users app ON pr.approved_by = app.id
-        LEFT JOIN units unt ON pr.unit_id = unt.id
-        ORDER BY pr.created_at DESC
-        LIMIT 100
-    """
-    return execute_query(query)
+    # Rows are encoded and sent while the rest are still being fetched
+    return StreamingResponse(iter_json_array(stream_query(_PURCHASE_REQUISITIONS_QUERY, user=current_user)), media_type="application/json")
+
+# Every dashboard count in one round-trip. Requisition counts come from the
+# trigger-maintained requisition_status_counts table (sql_setup/13), where a
+# NULL status is counted under ''.
+_DASHBOARD_COUNTS_QUERY = text("""
+    WITH requisition_counts AS (
+        SELECT status, priority, count FROM requisition_status_counts
+    ),
+    status_counts AS (
+        SELECT status, SUM(count) as count
+        FROM requisition_counts
+        WHERE status <> ''
+        GROUP BY status
+        HAVING SUM(count) > 0
+    )
+    SELECT 
+        (SELECT COALESCE(SUM(count), 0)::bigint FROM requisition_counts) as total_requisitions,
+        (SELECT COUNT(*) FROM products WHERE is_active = true) as total_products,
+        (SELECT COUNT(*) FROM suppliers WHERE is_active = true) as total_suppliers,
+        (SELECT COUNT(*) FROM units WHERE is_active = true) as total_units,
+        (SELECT COUNT(*) FROM users WHERE is_active = true) as total_users,
+        COALESCE((SELECT json_object_agg(status, count) FROM status_counts), '{}'::json) as status_counts,
+        (
+            SELECT COALESCE(SUM(count), 0)::bigint FROM requisition_counts
+            WHERE priority IN ('urgent', 'high')
+            AND status NOT IN ('', 'completed', 'cancelled', 'rejected')
+        ) as urgent_count
+""")
+
+async def _get_dashboard_counts() -> Dict[str, Any]:
+    """Run _DASHBOARD_COUNTS_QUERY and add the derived pending_approval count"""
+    counts = dict((await execute_query(_DASHBOARD_COUNTS_QUERY))[0])
+    status_counts = counts['status_counts']
+    counts['pending_approval'] = status_counts.get('submitted', 0) + status_counts.get('under_review', 0)
+    return counts
 
 @router.get("/dashboard/stats")
 async def get_dashboard_stats(current_user: User = Depends(get_current_user)):
     """Get dashboard statistics"""
-    
-    # Get requisition counts by status
-    status_query = """
-        SELECT status, COUNT(*) as count
-        FROM purchase_requisitions
-        GROUP BY status
-    """
-    status_data = execute_query(status_query)
-    status_counts = {row['status']: row['count'] for row in status_data}
-    
-    # Get total counts
-    totals_query = """
-        SELECT 
-            (SELECT COUNT(*) FROM purchase_requisitions) as total_requisitions,
-            (SELECT COUNT(*) FROM products WHERE is_active = true) as total_products,
-            (SELECT COUNT(*) FROM suppliers WHERE is_active = true) as total_suppliers,
-            (SELECT COUNT(*) FROM units WHERE is_active = true) as total_units
-    """
-    totals_data = execute_query(totals_query)
-    totals = totals_data[0] if totals_data else {}
-    
-    # Get urgent requisitions
-    urgent_query = """
-        SELECT COUNT(*) as urgent_count
-        FROM purchase_requisitions
-        WHERE priority IN ('urgent', 'high')
-        AND status NOT IN ('completed', 'cancelled', 'rejected')
-    """
-    urgent_data = execute_query(urgent_query)
-    urgent_count = urgent_data[0]['urgent_count'] if urgent_data else 0
+    counts = await _get_dashboard_counts()
     
     return {
-        "total_requisitions": totals.get('total_requisitions', 0),
-        "total_products": totals.get('total_products', 0),
-        "total_suppliers": totals.get('total_suppliers', 0),
-        "total_units": totals.get('total_units', 0),
-        "status_counts": status_counts,
-        "urgent_count": urgent_count,
-        "pending_approval": status_counts.get('submitted', 0) + status_counts.get('under_review', 0)
+        "total_requisitions": counts['total_requisitions'],
+        "total_products": counts['total_products'],
+        "total_suppliers": counts['total_suppliers'],
+        "total_units": counts['total_units'],
+        "status_counts": counts['status_counts'],
+        "urgent_count": counts['urgent_count'],
+        "pending_approval": counts['pending_approval']
     }
 
+_NOTIFICATIONS_QUERY = text("""
+    SELECT id, title, message, type, related_entity_type,
+           related_entity_id, is_read, created_at, read_at
+    FROM notifications
+    WHERE user_id = :user_id
+    ORDER BY created_at DESC
+    LIMIT 50
+""")
+
 @router.get("/notifications")
 async def get_notifications(current_user: User = Depends(get_current_user)):
     """Get user notifications"""
-    query = """
-        SELECT id::text, title, message, type, related_entity_type,
-               related_entity_id::text, is_read, created_at, read_at
-        FROM notifications
-        WHERE user_id = :user_id
-        ORDER BY created_at DESC
-        LIMIT 50
-    """
-    return execute_query(query, {"user_id": current_user.id})
+    return ORJSONResponse(await execute_query(_NOTIFICATIONS_QUERY, {"user_id": current_user.id}))
 
 @router.get("/admin/dashboard-stats")
-async def get_dashboard_stats(current_user: User = Depends(get_current_user)):
+async def get_admin_dashboard_stats(current_user: User = Depends(get_current_user)):
     """Get dashboard statistics for admin users"""
     # Check if user has admin permissions
     if current_user.role not in ['admin', 'superuser', 'manager']:
@@ -178,47 +367,17 @@ async def get_dashboard_stats(current_user: User = Depends(get_current_user)):
         )
     
     try:
-        # Get counts for all major entities
-        stats_query = """
-            SELECT 
-                (SELECT COUNT(*) FROM products WHERE is_active = true) as total_products,
-                (SELECT COUNT(*) FROM suppliers WHERE is_active = true) as total_suppliers,
-                (SELECT COUNT(*) FROM units WHERE is_active = true) as total_units,
-                (SELECT COUNT(*) FROM users WHERE is_active = true) as total_users,
-                (SELECT COUNT(*) FROM purchase_requisitions) as total_requisitions
-        """
-        
-        stats_result = execute_query(stats_query)
-        stats = stats_result[0] if stats_result else {}
-        
-        # Get requisition status counts
-        status_query = """
-            SELECT status, COUNT(*) as count
-            FROM purchase_requisitions
-            GROUP BY status
-        """
-        status_result = execute_query(status_query)
-        status_counts = {row['status']: row['count'] for row in status_result}
-        
-        # Get urgent requisitions count
-        urgent_query = """
-            SELECT COUNT(*) as count
-            FROM purchase_requisitions
-            WHERE priority IN ('urgent', 'high')
-            AND status NOT IN ('completed', 'cancelled', 'rejected')
-        """
-        urgent_result = execute_query(urgent_query)
-        urgent_count = urgent_result[0]['count'] if urgent_result else 0
+        counts = await _get_dashboard_counts()
         
         return {
-            "total_products": stats.get('total_products', 0),
-            "total_suppliers": stats.get('total_suppliers', 0),
-            "total_units": stats.get('total_units', 0),
-            "total_users": stats.get('total_users', 0),
-            "total_requisitions": stats.get('total_requisitions', 0),
-            "status_counts": status_counts,
-            "urgent_count": urgent_count,
-            "pending_approval": status_counts.get('submitted', 0) + status_counts.get('under_review', 0)
+            "total_products": counts['total_products'],
+            "total_suppliers": counts['total_suppliers'],
+            "total_units": counts['total_units'],
+            "total_users": counts['total_users'],
+            "total_requisitions": counts['total_requisitions'],
+            "status_counts": counts['status_counts'],
+            "urgent_count": counts['urgent_count'],
+            "pending_approval": counts['pending_approval']
         }
         
     except Exception as e:
@@ -227,6 +386,12 @@ async def get_dashboard_stats(current_user: User = Depends(get_current_user)):
             detail=f"Database error: {str(e)}"
         )
 
+_UPDATE_PASSWORD_QUERY = text("""
+    UPDATE users 
+    SET hashed_password = :hashed_password, updated_at = CURRENT_TIMESTAMP
+    WHERE id = :user_id
+""")
+
 @router.post("/admin/reset-password")
 async def reset_user_password(
     user_data: dict,
@@ -250,35 +415,22 @@ async def reset_user_password(
         )
     
     try:
-        # Hash the new password
-        import bcrypt
-        hashed_password = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        # Hash the new password; bcrypt is deliberately slow, so off the event loop
+        hashed_password = await run_in_threadpool(get_password_hash, new_password)
         
         # Update user password
-        update_query = """
-            UPDATE users 
-            SET password_hash = :password_hash, updated_at = CURRENT_TIMESTAMP
-            WHERE id = :user_id
-        """
+        updated = await execute_write(_UPDATE_PASSWORD_QUERY, {
+            "hashed_password": hashed_password,
+            "user_id": user_id
+        })
         
-        if not engine:
+        if updated == 0:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Database connection not available"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
             )
         
-        with engine.connect() as conn:
-            result = conn.execute(text(update_query), {
-                "password_hash": hashed_password,
-                "user_id": user_id
-            })
-            conn.commit()
-            
-            if result.rowcount == 0:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="User not found"
-                )
+        invalidate_user_cache(user_id)
         
         return {
             "message": "Password reset successfully",
@@ -292,6 +444,10 @@ async def reset_user_password(
             detail=f"Password reset failed: {str(e)}"
         )
 
+_PASSWORD_HASH_QUERY = text("""
+    SELECT hashed_password FROM users WHERE id = :user_id
+""")
+
 @router.post("/change-password")
 async def change_own_password(
     password_data: dict,
@@ -308,13 +464,8 @@ async def change_own_password(
         )
     
     try:
-        import bcrypt
-        
         # Get current password hash
-        check_query = """
-            SELECT password_hash FROM users WHERE id = :user_id
-        """
-        result = execute_query(check_query, {"user_id": str(current_user.id)})
+        result = await execute_query(_PASSWORD_HASH_QUERY, {"user_id": str(current_user.id)})
         
         if not result:
             raise HTTPException(
@@ -322,31 +473,26 @@ async def change_own_password(
                 detail="User not found"
             )
         
-        current_hash = result[0]['password_hash']
+        current_hash = result[0]['hashed_password']
         
         # Verify current password
-        if not bcrypt.checkpw(current_password.encode('utf-8'), current_hash.encode('utf-8')):
+        # bcrypt is deliberately slow; run it off the event loop
+        if not await run_in_threadpool(verify_password, current_password, current_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Current password is incorrect"
             )
         
         # Hash new password
-        new_hash = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        new_hash = await run_in_threadpool(get_password_hash, new_password)
         
         # Update password
-        update_query = """
-            UPDATE users 
-            SET password_hash = :password_hash, updated_at = CURRENT_TIMESTAMP
-            WHERE id = :user_id
-        """
-        
-        with engine.connect() as conn:
-            conn.execute(text(update_query), {
-                "password_hash": new_hash,
-                "user_id": str(current_user.id)
-            })
-            conn.commit()
+        await execute_write(_UPDATE_PASSWORD_QUERY, {
+            "hashed_password": new_hash,
+            "user_id": str(current_user.id)
+        })
+        
+        invalidate_user_cache(current_user.id)
         
         return {"message": "Password changed successfully"}
         
@@ -358,6 +504,12 @@ async def change_own_password(
             detail=f"Password change failed: {str(e)}"
         )
 
+_ACTIVE_USER_BY_EMAIL_QUERY = text("""
+    SELECT id, email, first_name, last_name
+    FROM users
+    WHERE email = :email AND is_active = true
+""")
+
 @router.post("/auth/password-reset")
 async def request_password_reset(email_data: dict):
     """Request password reset for a user"""
@@ -370,12 +522,7 @@ async def request_password_reset(email_data: dict):
     
     try:
         # Check if user exists
-        user_query = """
-            SELECT id::text, email, first_name, last_name
-            FROM users
-            WHERE email = :email AND is_active = true
-        """
-        user_result = execute_query(user_query, {"email": email})
+        user_result = await execute_query(_ACTIVE_USER_BY_EMAIL_QUERY, {"email": email})
         
         if not user_result:
             # Don't reveal if user exists or not for security
@@ -392,7 +539,6 @@ async def request_password_reset(email_data: dict):
         # 3. Send email with reset link
         
         # For demo purposes, we'll simulate this
-        import uuid
         reset_token = str(uuid.uuid4())
         
         return {
@@ -408,6 +554,41 @@ async def request_password_reset(email_data: dict):
             detail=f"Password reset error: {str(e)}"
         )
 
+# Unit info and its user, product and requisition counts in one query, each
+# count grouped once over its table rather than queried per unit. Without
+# products.unit_id every unit has a product count of 0.
+_UNITS_CONFIGURATION_SQL = """
+    SELECT 
+        u.id,
+        u.name,
+        u.code,
+        u.description,
+        u.address,
+        u.city,
+        u.country,
+        u.is_active,
+        u.created_at,
+        u.updated_at,
+        COALESCE(uc.count, 0) as user_count,
+        COALESCE(pc.count, 0) as product_count,
+        COALESCE(rc.count, 0) as requisition_count
+    FROM units u
+    LEFT JOIN (
+        SELECT unit_id, COUNT(*) as count FROM users GROUP BY unit_id
+    ) uc ON uc.unit_id = u.id
+    LEFT JOIN ({product_counts}) pc ON pc.unit_id = u.id
+    LEFT JOIN (
+        SELECT unit_id, COUNT(*) as count FROM purchase_requisitions GROUP BY unit_id
+    ) rc ON rc.unit_id = u.id
+    ORDER BY u.name
+"""
+_UNITS_CONFIGURATION_QUERY = text(_UNITS_CONFIGURATION_SQL.format(
+    product_counts="SELECT unit_id, COUNT(*) as count FROM products GROUP BY unit_id"
+))
+_UNITS_CONFIGURATION_NO_PRODUCTS_QUERY = text(_UNITS_CONFIGURATION_SQL.format(
+    product_counts="SELECT NULL::uuid as unit_id, 0 as count WHERE false"
+))
+
 @router.get("/admin/units/configuration")
 async def get_units_configuration(current_user: User = Depends(get_current_user)):
     """Get detailed unit configuration (Admin only)"""
@@ -418,54 +599,9 @@ async def get_units_configuration(current_user: User = Depends(get_current_user)
         )
     
     try:
-        # Get basic unit info first
-        units_query = """
-            SELECT 
-                id::text,
-                name,
-                code,
-                description,
-                address,
-                city,
-                country,
-                is_active,
-                created_at,
-                updated_at
-            FROM units
-            ORDER BY name
-        """
-        
-        units = execute_query(units_query)
-        
-        # Add stats for each unit
-        for unit in units:
-            unit_id = unit['id']
-            
-            # Get user count
-            user_count_query = """
-                SELECT COUNT(*) as count FROM users WHERE unit_id = :unit_id
-            """
-            user_result = execute_query(user_count_query, {"unit_id": unit_id})
-            unit['user_count'] = user_result[0]['count'] if user_result else 0
-            
-            # Get product count (if products table has unit_id)
-            try:
-                product_count_query = """
-                    SELECT COUNT(*) as count FROM products WHERE unit_id = :unit_id
-                """
-                product_result = execute_query(product_count_query, {"unit_id": unit_id})
-                unit['product_count'] = product_result[0]['count'] if product_result else 0
-            except:
-                unit['product_count'] = 0
-            
-            # Get requisition count
-            req_count_query = """
-                SELECT COUNT(*) as count FROM purchase_requisitions WHERE unit_id = :unit_id
-            """
-            req_result = execute_query(req_count_query, {"unit_id": unit_id})
-            unit['requisition_count'] = req_result[0]['count'] if req_result else 0
-        
-        return units
+        query = _UNITS_CONFIGURATION_QUERY if await _products_have_unit_id() else _UNITS_CONFIGURATION_NO_PRODUCTS_QUERY
+        # Admins see every unit's requisition counts, as on /admin/dashboard-stats
+        return ORJSONResponse(await execute_query(query, system_wide=True))
         
     except Exception as e:
         raise HTTPException(
@@ -473,6 +609,19 @@ async def get_units_configuration(current_user: User = Depends(get_current_user)
             detail=f"Failed to get unit configuration: {str(e)}"
         )
 
+_CONFIGURE_UNIT_QUERY = text("""
+    UPDATE units 
+    SET 
+        name = COALESCE(:name, name),
+        description = COALESCE(:description, description),
+        address = COALESCE(:address, address),
+        city = COALESCE(:city, city),
+        country = COALESCE(:country, country),
+        is_active = COALESCE(:is_active, is_active),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = :unit_id
+""")
+
 @router.post("/admin/units/configure")
 async def configure_unit(
     unit_data: dict,
@@ -494,42 +643,23 @@ async def configure_unit(
     
     try:
         # Update unit configuration
-        update_query = """
-            UPDATE units 
-            SET 
-                name = COALESCE(:name, name),
-                description = COALESCE(:description, description),
-                address = COALESCE(:address, address),
-                city = COALESCE(:city, city),
-                country = COALESCE(:country, country),
-                is_active = COALESCE(:is_active, is_active),
-                updated_at = CURRENT_TIMESTAMP
-            WHERE id = :unit_id
-        """
-        
-        if not engine:
+        updated = await execute_write(_CONFIGURE_UNIT_QUERY, {
+            "unit_id": unit_id,
+            "name": unit_data.get("name"),
+            "description": unit_data.get("description"),
+            "address": unit_data.get("address"),
+            "city": unit_data.get("city"),
+            "country": unit_data.get("country"),
+            "is_active": unit_data.get("is_active")
+        })
+        
+        if updated == 0:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Database connection not available"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Unit not found"
             )
         
-        with engine.connect() as conn:
-            result = conn.execute(text(update_query), {
-                "unit_id": unit_id,
-                "name": unit_data.get("name"),
-                "description": unit_data.get("description"),
-                "address": unit_data.get("address"),
-                "city": unit_data.get("city"),
-                "country": unit_data.get("country"),
-                "is_active": unit_data.get("is_active")
-            })
-            conn.commit()
-            
-            if result.rowcount == 0:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Unit not found"
-                )
+        clear_cache(UNITS_CACHE)
         
         return {"message": "Unit configuration updated successfully", "unit_id": unit_id}
         
@@ -541,6 +671,21 @@ async def configure_unit(
             detail=f"Unit configuration failed: {str(e)}"
         )
 
+# Each figure is its own scalar subquery: cross joining the tables built the
+# product of all of them just to count each one, and returned nothing at all
+# as soon as any table was empty.
+_SYSTEM_INFO_QUERY = text("""
+    SELECT 
+        'system_info' as setting_type,
+        (SELECT COUNT(*) FROM units) as total_units,
+        (SELECT COUNT(*) FROM users) as total_users,
+        (SELECT COUNT(*) FROM products) as total_products,
+        (SELECT COUNT(*) FROM suppliers) as total_suppliers,
+        (SELECT COUNT(*) FROM purchase_requisitions) as total_requisitions,
+        (SELECT MAX(created_at) FROM purchase_requisitions) as last_requisition_date,
+        (SELECT MAX(created_at) FROM users) as last_user_created
+""")
+
 @router.get("/admin/system-settings")
 async def get_system_settings(current_user: User = Depends(get_current_user)):
     """Get system-wide settings (Admin only)"""
@@ -552,27 +697,10 @@ async def get_system_settings(current_user: User = Depends(get_current_user)):
     
     try:
         # Get system statistics and settings
-        system_query = """
-            SELECT 
-                'system_info' as setting_type,
-                COUNT(DISTINCT u.id) as total_units,
-                COUNT(DISTINCT us.id) as total_users,
-                COUNT(DISTINCT p.id) as total_products,
-                COUNT(DISTINCT s.id) as total_suppliers,
-                COUNT(DISTINCT pr.id) as total_requisitions,
-                MAX(pr.created_at) as last_requisition_date,
-                MAX(us.created_at) as last_user_created
-            FROM units u
-            CROSS JOIN users us
-            CROSS JOIN products p
-            CROSS JOIN suppliers s
-            CROSS JOIN purchase_requisitions pr
-        """
-        
-        settings = execute_query(system_query)
+        settings = await execute_query(_SYSTEM_INFO_QUERY, system_wide=True)
         
         # Add version and configuration info
-        system_info = settings[0] if settings else {}
+        system_info = dict(settings[0]) if settings else {}
         system_info.update({
             "app_version": "1.0.0",
             "database_type": "PostgreSQL (Supabase)",
@@ -590,7 +718,7 @@ async def get_system_settings(current_user: User = Depends(get_current_user)):
             ]
         })
         
-        return system_info
+        return ORJSONResponse(system_info)
         
     except Exception as e:
         raise HTTPException(
@@ -598,38 +726,57 @@ async def get_system_settings(current_user: User = Depends(get_current_user)):
             detail=f"Failed to get system settings: {str(e)}"
         )
 
+_UNIT_NAMES_QUERY = text("""
+    SELECT id, name FROM units
+""")
+
+async def _unit_name(unit_id: Optional[UUID]) -> Optional[str]:
+    """
+    Look up a unit's name in a cached id -> name map of every unit.
+    
+    The map lives in UNITS_CACHE, so unit writes drop it; an id missing from
+    it (a unit created since) reloads it once.
+    """
+    if unit_id is None:
+        return None
+    cache = get_cache(UNITS_CACHE, ttl=60)
+    names = cache.get("unit_names")
+    if names is None or unit_id not in names:
+        async def fetch() -> Dict[UUID, str]:
+            return {row["id"]: row["name"] for row in await execute_query(_UNIT_NAMES_QUERY)}
+        
+        names = await singleflight((UNITS_CACHE, "unit_names"), fetch)
+        cache["unit_names"] = names
+    return names.get(unit_id)
+
 @router.get("/me")
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """Get current user information"""
-    query = """
-        SELECT id::text, email, first_name, last_name, role, unit_id::text,
-               is_active, is_superuser, created_at, updated_at
-        FROM users
-        WHERE id = :user_id
-    """
-    result = execute_query(query, {"user_id": str(current_user.id)})
-    
-    if not result:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    
-    user_data = result[0]
-    
-    # Get unit name if unit_id exists
-    if user_data.get('unit_id'):
-        unit_query = """
-            SELECT name
-            FROM units
-            WHERE id = :unit_id
-        """
-        unit_result = execute_query(unit_query, {"unit_id": user_data['unit_id']})
-        user_data['unit_name'] = unit_result[0]['name'] if unit_result else None
-    else:
-        user_data['unit_name'] = None
-    
-    return user_data
+    # get_current_user has already loaded the user; only the unit name is
+    # looked up, and that from a cache
+    return {
+        "id": str(current_user.id),
+        "email": current_user.email,
+        "first_name": current_user.first_name,
+        "last_name": current_user.last_name,
+        "role": current_user.role,
+        "unit_id": str(current_user.unit_id) if current_user.unit_id else None,
+        "is_active": current_user.is_active,
+        "is_superuser": current_user.is_superuser,
+        "created_at": current_user.created_at,
+        "updated_at": current_user.updated_at,
+        "unit_name": await _unit_name(current_user.unit_id)
+    }
+
+_INSERT_SUPPLIER_QUERY = text("""
+    INSERT INTO suppliers (id, name, code, contact_person, email, phone, address, 
+                         city, country, payment_terms, currency, rating)
+    VALUES (:id, :name, :code, :contact_person, :email, :phone, :address, 
+            :city, :country, :payment_terms, :currency, :rating)
+    RETURNING id, name, code, contact_person, email, phone, address, city, country,
+              tax_number, payment_terms, credit_limit, currency, rating, is_active,
+              created_at, updated_at
+""")
 
 @router.post("/suppliers")
 async def create_supplier_simple(
@@ -644,17 +791,9 @@ async def create_supplier_simple(
             detail="Not enough permissions"
         )
     
-    import uuid
     new_id = str(uuid.uuid4())
     
     # Insert new supplier
-    insert_query = """
-        INSERT INTO suppliers (id, name, code, contact_person, email, phone, address, 
-                             city, country, payment_terms, currency, rating)
-        VALUES (:id, :name, :code, :contact_person, :email, :phone, :address, 
-                :city, :country, :payment_terms, :currency, :rating)
-    """
-    
     params = {
         "id": new_id,
         "name": supplier_data.get("name"),
@@ -671,34 +810,12 @@ async def create_supplier_simple(
     }
     
     try:
-        if not engine:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Database connection not available"
-            )
+        # The created supplier comes back from the INSERT itself
+        supplier = await execute_write_returning(_INSERT_SUPPLIER_QUERY, params)
+        clear_cache(SUPPLIERS_CACHE)
+        
+        return ORJSONResponse(supplier)
         
-        with engine.connect() as conn:
-            conn.execute(text(insert_query), params)
-            conn.commit()
-        
-        # Return the created supplier
-        get_query = """
-            SELECT id::text, name, code, contact_person, email, phone, address, city, country,
-                   tax_number, payment_terms, credit_limit, currency, rating, is_active,
-                   created_at, updated_at
-            FROM suppliers 
-            WHERE id = :supplier_id
-        """
-        result = execute_query(get_query, {"supplier_id": new_id})
-        
-        if result:
-            return result[0]
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to retrieve created supplier"
-            )
-            
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,110 +1,122 @@
 """
 Suppliers API endpoints for the Hotel Procurement System
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import String, bindparam, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.cache import cached_response, clear_cache, read_through
+from app.core.database import get_async_db
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_name_cursor, next_name_cursor
+from app.core.responses import ORJSONResponse, dumps
 from app.core.security import get_current_user
 from app.models.user import User
 from app.schemas.supplier import Supplier, SupplierCreate, SupplierUpdate
 
 router = APIRouter()
 
-@router.get("/", response_model=List[Supplier])
+# Suppliers change rarely; list pages and single suppliers are cached briefly
+# as encoded JSON, so a hit is sent without touching the database or encoding
+# again. Every supplier write must clear_cache(SUPPLIERS_CACHE).
+SUPPLIERS_CACHE = "suppliers"
+
+# Each statement is built once at import, so requests only bind parameters
+
+_SUPPLIER_COLUMNS = """
+    id, name, code, contact_person, email, phone, address, city, country,
+    tax_number, payment_terms, credit_limit, currency, rating, is_active,
+    created_at, updated_at
+"""
+
+_SUPPLIER_PAGE = text(f"""
+    SELECT {_SUPPLIER_COLUMNS}
+    FROM suppliers 
+    WHERE is_active = true
+    AND (:after_name IS NULL OR (name, id) > (:after_name, :after_id))
+    ORDER BY name, id
+    LIMIT :limit OFFSET :skip
+""").bindparams(
+    bindparam("after_name", type_=String), bindparam("after_id", type_=PG_UUID(as_uuid=True))
+)
+
+_SUPPLIER_BY_ID = text(f"""
+    SELECT {_SUPPLIER_COLUMNS}
+    FROM suppliers 
+    WHERE id = :supplier_id
+""").bindparams(bindparam("supplier_id", type_=PG_UUID(as_uuid=True)))
+
+# The id comes from the column default, and RETURNING gives back the stored
+# row, so no follow-up SELECT is needed
+_INSERT_SUPPLIER = text(f"""
+    INSERT INTO suppliers (name, code, contact_person, email, phone, address, 
+                         city, country, payment_terms, currency, rating)
+    VALUES (:name, :code, :contact_person, :email, :phone, :address, 
+            :city, :country, :payment_terms, :currency, :rating)
+    RETURNING {_SUPPLIER_COLUMNS}
+""")
+
+@router.get("/", response_class=ORJSONResponse, responses={200: {"model": List[Supplier]}})
 async def get_suppliers(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header (skip is ignored)"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all suppliers"""
-    from sqlalchemy import text
-    
-    result = db.execute(text("""
-        SELECT id, name, code, contact_person, email, phone, address, city, country,
-               tax_number, payment_terms, credit_limit, currency, rating, is_active,
-               created_at, updated_at
-        FROM suppliers 
-        WHERE is_active = true
-        ORDER BY name
-        LIMIT :limit OFFSET :skip
-    """), {"limit": limit, "skip": skip})
+    """Get all suppliers, in (name, id) order"""
+    # A cursor seeks straight to the next page on the (name, id) index, where
+    # an offset would read and discard every earlier row; skip stays for
+    # clients that do not send one yet
+    after_name, after_id = decode_name_cursor(after) if after else (None, None)
+    if after:
+        skip = 0
     
-    suppliers = []
-    for row in result:
-        suppliers.append({
-            "id": str(row.id),
-            "name": row.name,
-            "code": row.code,
-            "contact_person": row.contact_person,
-            "email": row.email,
-            "phone": row.phone,
-            "address": row.address,
-            "city": row.city,
-            "country": row.country,
-            "tax_number": row.tax_number,
-            "payment_terms": row.payment_terms,
-            "credit_limit": float(row.credit_limit) if row.credit_limit else None,
-            "currency": row.currency,
-            "rating": row.rating,
-            "is_active": row.is_active,
-            "created_at": row.created_at.isoformat() if row.created_at else None,
-            "updated_at": row.updated_at.isoformat() if row.updated_at else None
+    async def fetch() -> Tuple[bytes, Optional[str]]:
+        result = await db.execute(_SUPPLIER_PAGE, {
+            "limit": limit,
+            "skip": skip,
+            "after_name": after_name,
+            "after_id": after_id
         })
+        
+        # orjson encodes the UUID, Decimal and datetime values itself
+        suppliers = result.mappings().all()
+        return dumps(suppliers), next_name_cursor(suppliers, limit)
     
-    return suppliers
+    (body, next_cursor), stale = await read_through(
+        SUPPLIERS_CACHE, ("list", skip, limit, after_name, after_id), fetch
+    )
+    return cached_response(body, stale, {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
 
-@router.get("/{supplier_id}", response_model=Supplier)
+@router.get("/{supplier_id}", response_class=ORJSONResponse, responses={200: {"model": Supplier}})
 async def get_supplier(
     supplier_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific supplier by ID"""
-    from sqlalchemy import text
-    
-    result = db.execute(text("""
-        SELECT id, name, code, contact_person, email, phone, address, city, country,
-               tax_number, payment_terms, credit_limit, currency, rating, is_active,
-               created_at, updated_at
-        FROM suppliers 
-        WHERE id = :supplier_id
-    """), {"supplier_id": str(supplier_id)})
+    async def fetch() -> Optional[bytes]:
+        result = await db.execute(_SUPPLIER_BY_ID, {"supplier_id": supplier_id})
+        row = result.mappings().first()
+        return dumps(row) if row else None
     
-    row = result.first()
-    if not row:
+    # A missing supplier is not cached, so it is looked up again next time
+    body, stale = await read_through(SUPPLIERS_CACHE, ("supplier", supplier_id), fetch)
+    if body is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Supplier not found"
         )
     
-    return {
-        "id": str(row.id),
-        "name": row.name,
-        "code": row.code,
-        "contact_person": row.contact_person,
-        "email": row.email,
-        "phone": row.phone,
-        "address": row.address,
-        "city": row.city,
-        "country": row.country,
-        "tax_number": row.tax_number,
-        "payment_terms": row.payment_terms,
-        "credit_limit": float(row.credit_limit) if row.credit_limit else None,
-        "currency": row.currency,
-        "rating": row.rating,
-        "is_active": row.is_active,
-        "created_at": row.created_at.isoformat() if row.created_at else None,
-        "updated_at": row.updated_at.isoformat() if row.updated_at else None
-    }
+    return cached_response(body, stale)
 
-@router.post("/", response_model=Supplier, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_class=ORJSONResponse, status_code=status.HTTP_201_CREATED, responses={201: {"model": Supplier}})
 async def create_supplier(
     supplier: SupplierCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new supplier"""
@@ -115,18 +127,7 @@ async def create_supplier(
             detail="Not enough permissions"
         )
     
-    from sqlalchemy import text
-    import uuid
-    
-    new_id = str(uuid.uuid4())
-    
-    db.execute(text("""
-        INSERT INTO suppliers (id, name, code, contact_person, email, phone, address, 
-                             city, country, payment_terms, currency, rating)
-        VALUES (:id, :name, :code, :contact_person, :email, :phone, :address, 
-                :city, :country, :payment_terms, :currency, :rating)
-    """), {
-        "id": new_id,
+    result = await db.execute(_INSERT_SUPPLIER, {
         "name": supplier.name,
         "code": supplier.code,
         "contact_person": supplier.contact_person,
@@ -139,7 +140,8 @@ async def create_supplier(
         "currency": supplier.currency,
         "rating": supplier.rating
     })
-    db.commit()
+    row = result.mappings().one()
+    await db.commit()
+    clear_cache(SUPPLIERS_CACHE)
     
-    # Return the created supplier
-    return await get_supplier(UUID(new_id), db, current_user)
+    return ORJSONResponse(row, status_code=status.HTTP_201_CREATED)
@@ -1,94 +1,118 @@
 """
 Units API endpoints for the Hotel Procurement System
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import RowMapping, String, bindparam, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from app.core.database import get_sync_db
+from app.core.cache import cached_response, clear_cache, read_through
+from app.core.database import get_async_db
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_name_cursor, next_name_cursor
+from app.core.responses import ORJSONResponse, dumps
 from app.core.security import get_current_user
 from app.models.user import User
 from app.schemas.unit import Unit, UnitCreate, UnitUpdate
 
 router = APIRouter()
 
-@router.get("/", response_model=List[Unit])
+# Units change rarely; list pages are cached briefly as encoded JSON, and the
+# namespace is shared with anything else that caches unit data. Every unit
+# write must clear_cache(UNITS_CACHE).
+UNITS_CACHE = "units"
+
+# Each statement is built once at import, so requests only bind parameters
+
+_UNIT_COLUMNS = """
+    id, name, code, description, address, city, country, 
+    is_active, created_at, updated_at
+"""
+
+_UNIT_PAGE = text(f"""
+    SELECT {_UNIT_COLUMNS}
+    FROM units 
+    WHERE is_active = true
+    AND (:after_name IS NULL OR (name, id) > (:after_name, :after_id))
+    ORDER BY name, id
+    LIMIT :limit OFFSET :skip
+""").bindparams(
+    bindparam("after_name", type_=String), bindparam("after_id", type_=PG_UUID(as_uuid=True))
+)
+
+_UNIT_BY_ID = text(f"""
+    SELECT {_UNIT_COLUMNS}
+    FROM units 
+    WHERE id = :unit_id
+""").bindparams(bindparam("unit_id", type_=PG_UUID(as_uuid=True)))
+
+# The id comes from the column default, and RETURNING gives back the stored
+# row, so no follow-up SELECT is needed
+_INSERT_UNIT = text(f"""
+    INSERT INTO units (name, code, description, address, city, country)
+    VALUES (:name, :code, :description, :address, :city, :country)
+    RETURNING {_UNIT_COLUMNS}
+""")
+
+@router.get("/", response_class=ORJSONResponse, responses={200: {"model": List[Unit]}})
 async def get_units(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_sync_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header (skip is ignored)"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all hotel units/properties"""
-    from sqlalchemy import text
-    
-    result = db.execute(text("""
-        SELECT id, name, code, description, address, city, country, 
-               is_active, created_at, updated_at
-        FROM units 
-        WHERE is_active = true
-        ORDER BY name
-        LIMIT :limit OFFSET :skip
-    """), {"limit": limit, "skip": skip})
+    """Get all hotel units/properties, in (name, id) order"""
+    # A cursor seeks straight to the next page on the (name, id) index, where
+    # an offset would read and discard every earlier row; skip stays for
+    # clients that do not send one yet
+    after_name, after_id = decode_name_cursor(after) if after else (None, None)
+    if after:
+        skip = 0
     
-    units = []
-    for row in result:
-        units.append({
-            "id": str(row.id),
-            "name": row.name,
-            "code": row.code,
-            "description": row.description,
-            "address": row.address,
-            "city": row.city,
-            "country": row.country,
-            "is_active": row.is_active,
-            "created_at": row.created_at.isoformat() if row.created_at else None,
-            "updated_at": row.updated_at.isoformat() if row.updated_at else None
+    async def fetch() -> Tuple[bytes, Optional[str]]:
+        result = await db.execute(_UNIT_PAGE, {
+            "limit": limit,
+            "skip": skip,
+            "after_name": after_name,
+            "after_id": after_id
         })
+        
+        # orjson encodes the UUID and datetime values itself
+        units = result.mappings().all()
+        return dumps(units), next_name_cursor(units, limit)
     
-    return units
+    (body, next_cursor), stale = await read_through(
+        UNITS_CACHE, ("list", skip, limit, after_name, after_id), fetch
+    )
+    return cached_response(body, stale, {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
 
-@router.get("/{unit_id}", response_model=Unit)
-async def get_unit(
-    unit_id: UUID,
-    db: Session = Depends(get_sync_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Get a specific hotel unit by ID"""
-    from sqlalchemy import text
-    
-    result = db.execute(text("""
-        SELECT id, name, code, description, address, city, country, 
-               is_active, created_at, updated_at
-        FROM units 
-        WHERE id = :unit_id
-    """), {"unit_id": str(unit_id)})
+async def _fetch_unit(db: AsyncSession, unit_id: UUID) -> RowMapping:
+    """Load one unit as a row mapping, with a 404 if it does not exist."""
+    result = await db.execute(_UNIT_BY_ID, {"unit_id": unit_id})
     
-    row = result.first()
+    row = result.mappings().first()
     if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Unit not found"
         )
-    
-    return {
-        "id": str(row.id),
-        "name": row.name,
-        "code": row.code,
-        "description": row.description,
-        "address": row.address,
-        "city": row.city,
-        "country": row.country,
-        "is_active": row.is_active,
-        "created_at": row.created_at.isoformat() if row.created_at else None,
-        "updated_at": row.updated_at.isoformat() if row.updated_at else None
-    }
+    return row
 
-@router.post("/", response_model=Unit, status_code=status.HTTP_201_CREATED)
+@router.get("/{unit_id}", response_class=ORJSONResponse, responses={200: {"model": Unit}})
+async def get_unit(
+    unit_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a specific hotel unit by ID"""
+    return ORJSONResponse(await _fetch_unit(db, unit_id))
+
+@router.post("/", response_class=ORJSONResponse, status_code=status.HTTP_201_CREATED, responses={201: {"model": Unit}})
 async def create_unit(
     unit: UnitCreate,
-    db: Session = Depends(get_sync_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new hotel unit"""
@@ -99,16 +123,7 @@ async def create_unit(
             detail="Not enough permissions"
         )
     
-    from sqlalchemy import text
-    import uuid
-    
-    new_id = str(uuid.uuid4())
-    
-    db.execute(text("""
-        INSERT INTO units (id, name, code, description, address, city, country)
-        VALUES (:id, :name, :code, :description, :address, :city, :country)
-    """), {
-        "id": new_id,
+    result = await db.execute(_INSERT_UNIT, {
         "name": unit.name,
         "code": unit.code,
         "description": unit.description,
@@ -116,7 +131,8 @@ async def create_unit(
         "city": unit.city,
         "country": unit.country
     })
-    db.commit()
+    row = result.mappings().one()
+    await db.commit()
+    clear_cache(UNITS_CACHE)
     
-    # Return the created unit
-    return await get_unit(UUID(new_id), db, current_user)
+    return ORJSONResponse(row, status_code=status.HTTP_201_CREATED)
@@ -1,11 +1,12 @@
 """
 User Management API Routes
 """
-from typing import Any, List
+from typing import Any, Dict, List
 from fastapi import APIRouter, Depends, HTTPException, status
-from app.core.database import AsyncSessionWrapper
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.responses import ORJSONResponse
 from app.core.security import get_current_user, get_current_active_superuser
 from app.crud.user import user as crud_user
 from app.models.user import User
@@ -13,29 +14,39 @@ from app.schemas.user import UserResponse, UserCreate, UserUpdate
 
 router = APIRouter()
 
+# The UserResponse fields, read straight off User rows: the values come from
+# the database already typed, so responses skip UserResponse validation
+_USER_RESPONSE_FIELDS = tuple(UserResponse.model_fields)
 
-@router.get("/", response_model=List[UserResponse])
+
+def _user_row(user: User) -> Dict[str, Any]:
+    """A user as its UserResponse JSON object, without building the model."""
+    return {field: getattr(user, field) for field in _USER_RESPONSE_FIELDS}
+
+
+@router.get("/", response_class=ORJSONResponse, responses={200: {"model": List[UserResponse]}})
 async def read_users(
-    db: AsyncSessionWrapper = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(get_current_active_superuser)
 ) -> Any:
     """Get users (admin only)."""
     users = await crud_user.get_multi(db, skip=skip, limit=limit)
-    return [UserResponse.from_orm(user) for user in users]
+    # orjson encodes the UUID and datetime attributes itself
+    return ORJSONResponse([_user_row(user) for user in users])
 
 
-@router.post("/", response_model=UserResponse)
+@router.post("/", response_class=ORJSONResponse, responses={200: {"model": UserResponse}})
 async def create_user(
     user_in: UserCreate,
-    db: AsyncSessionWrapper = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_superuser)
 ) -> Any:
     """Create new user (admin only)."""
     try:
         user = await crud_user.create(db, obj_in=user_in)
-        return UserResponse.from_orm(user)
+        return ORJSONResponse(_user_row(user))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -43,10 +54,10 @@ async def create_user(
         )
 
 
-@router.get("/{user_id}", response_model=UserResponse)
+@router.get("/{user_id}", response_class=ORJSONResponse, responses={200: {"model": UserResponse}})
 async def read_user(
     user_id: str,
-    db: AsyncSessionWrapper = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ) -> Any:
     """Get user by ID."""
@@ -64,4 +75,4 @@ async def read_user(
             detail="Not enough permissions"
         )
     
-    return UserResponse.from_orm(user)
+    return ORJSONResponse(_user_row(user))
@@ -0,0 +1,106 @@
+"""
+In-process Response Caching
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from cachetools import LRUCache, TTLCache
+from fastapi import Response
+
+T = TypeVar("T")
+
+# One TTL cache per namespace so writers can invalidate just their own data
+_caches: Dict[str, TTLCache] = {}
+
+# The last value read_through() stored for each key, kept past its TTL so it
+# can still be served while the database is failing
+_stale_caches: Dict[str, LRUCache] = {}
+
+# Response header marking a body served from _stale_caches
+CACHE_HEADER = "X-Cache"
+
+# Futures for lookups currently running, shared by identical concurrent requests
+_inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+
+def get_cache(namespace: str, ttl: int = 60, maxsize: int = 256) -> TTLCache:
+    """Get the TTL cache for a namespace, creating it on first use."""
+    cache = _caches.get(namespace)
+    if cache is None:
+        cache = _caches[namespace] = TTLCache(maxsize=maxsize, ttl=ttl)
+    return cache
+
+
+def clear_cache(namespace: str) -> None:
+    """Drop every cached entry in a namespace."""
+    for caches in (_caches, _stale_caches):
+        cache = caches.get(namespace)
+        if cache is not None:
+            cache.clear()
+
+
+async def singleflight(key: Hashable, fetch: Callable[[], Awaitable[T]]) -> T:
+    """
+    Run fetch() once for all concurrent callers using the same key.
+
+    The first caller runs the lookup; everyone who arrives while it is still
+    running awaits the same result (or exception) instead of querying again.
+    """
+    future = _inflight.get(key)
+    if future is not None:
+        # Shield so a cancelled waiter does not cancel the shared lookup
+        return await asyncio.shield(future)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result = await fetch()
+    except BaseException as exc:
+        future.set_exception(exc)
+        # Mark the exception as retrieved in case nobody else was waiting
+        future.exception()
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(key, None)
+
+
+async def read_through(
+    namespace: str, key: Hashable, fetch: Callable[[], Awaitable[T]], ttl: int = 60
+) -> Tuple[T, bool]:
+    """
+    Get key from the namespace's TTL cache, running fetch() on a miss.
+
+    Concurrent misses share one fetch(). If it fails while an expired value
+    for key is still held, that value is returned instead (stale-if-error);
+    the second item says whether it was. A None from fetch() means "not
+    found" and is returned without being cached, so it is fetched again next
+    time and a later failure can never be answered with it.
+    """
+    cache = get_cache(namespace, ttl)
+    value = cache.get(key)
+    if value is not None:
+        return value, False
+
+    stale = _stale_caches.get(namespace)
+    if stale is None:
+        stale = _stale_caches[namespace] = LRUCache(maxsize=cache.maxsize)
+    try:
+        value = await singleflight((namespace, key), fetch)
+    except Exception:
+        if key in stale:
+            return stale[key], True
+        raise
+    if value is not None:
+        cache[key] = stale[key] = value
+    return value, False
+
+
+def cached_response(body: bytes, stale: bool, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Send a cached JSON body, marked with X-Cache: STALE when read_through fell back to it."""
+    response = Response(body, media_type="application/json", headers=headers)
+    if stale:
+        response.headers[CACHE_HEADER] = "STALE"
+    return response
@@ -1,7 +1,7 @@
 """
 Application Settings and Configuration
 """
-from typing import List
+from typing import List, Literal
 from pydantic import BaseModel, BaseSettings
 from functools import lru_cache
 
@@ -16,10 +16,37 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    # Reconnect pooled connections older than this (seconds); stale ones are
+    # also caught by pool_pre_ping before use
+    DB_POOL_RECYCLE: int = 1800
+    # Set when DATABASE_URL points at a transaction-mode pooler (PgBouncer,
+    # Supabase's pooler on port 6543): asyncpg must then not keep named
+    # prepared statements, since consecutive transactions may land on
+    # different server connections
+    DB_TRANSACTION_POOLER: bool = False
+    # Prepared statements kept per asyncpg connection; list endpoints bind
+    # unused filters to NULL so each one needs only a single statement here
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 512
+    # Optional hot standby for read-only endpoints; empty means reads use the
+    # primary database
+    READ_REPLICA_URL: str = ""
+    # Sent on every connection so pg_stat_activity and the server logs show
+    # which sessions are the API's
+    DB_APPLICATION_NAME: str = "procurement-rtg"
+    # Server-side limit on any one statement (milliseconds), so a runaway
+    # query cannot hold a pooled connection indefinitely; 0 leaves the
+    # server's default (PgBouncer only accepts it as a startup parameter if
+    # listed in its ignore_startup_parameters)
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
     
     # Security
     SECRET_KEY: str
-    ALGORITHM: str = "HS256"
+    # Tokens are signed with the shared SECRET_KEY and verified on every
+    # request; HMAC is far cheaper than RSA, so only HS* is accepted
+    ALGORITHM: Literal["HS256", "HS384", "HS512"] = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours for production
     
     # CORS
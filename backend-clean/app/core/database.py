@@ -1,12 +1,17 @@
 """
-Database Configuration and Session Management - SQLAlchemy 1.4 Compatible
+Database Configuration and Session Management
+
+The API runs on the asyncpg engine (async_engine, plus read_only_async_engine
+for replica reads). The psycopg2 engine is only for synchronous scripts such
+as setup_database.py; its pool opens no connections unless one of them uses it.
 """
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from sqlalchemy import create_engine, MetaData
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-import hashlib
-import secrets
+import uuid
 
 from app.core.config import settings
 
@@ -22,12 +27,33 @@ convention = {
 metadata = MetaData(naming_convention=convention)
 Base = declarative_base(metadata=metadata)
 
-# Create synchronous engine using psycopg2
+def get_server_settings() -> dict:
+    """Session settings every connection starts with."""
+    server_settings = {"application_name": settings.DB_APPLICATION_NAME}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+    return server_settings
+
+# Scripts are trusted maintenance jobs, so their sessions declare themselves
+# superusers to the requisition unit policy (sql_setup/17), which otherwise
+# hides every requisition from a session that has not been scoped
+SCRIPT_SERVER_SETTINGS = {"app.role": "superuser"}
+
+# Synchronous engine using psycopg2, for scripts
 engine = create_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
     pool_pre_ping=True,
-    pool_recycle=300
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    connect_args={
+        # libpq takes the session settings as -c options
+        "options": " ".join(
+            f"-c {name}={value}" for name, value in dict(get_server_settings(), **SCRIPT_SERVER_SETTINGS).items()
+        )
+    }
 )
 
 # Create synchronous session factory
@@ -37,10 +63,77 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
-# Simple synchronous database session dependency
+def get_async_database_url(database_url: str = settings.DATABASE_URL) -> URL:
+    """Return a database URL (DATABASE_URL by default) rewritten for the asyncpg driver."""
+    url = make_url(database_url).set(drivername="postgresql+asyncpg")
+    # asyncpg takes "ssl" rather than libpq's "sslmode"
+    sslmode = url.query.get("sslmode")
+    if sslmode:
+        url = url.difference_update_query(["sslmode"]).update_query_dict({"ssl": sslmode})
+    cache_size = 0 if settings.DB_TRANSACTION_POOLER else settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+    return url.update_query_dict({"prepared_statement_cache_size": str(cache_size)})
+
+def get_async_connect_args(**server_settings: str) -> dict:
+    """asyncpg connect() arguments for the configured pooling setup, plus any extra session settings."""
+    connect_args = {"server_settings": dict(get_server_settings(), **server_settings)}
+    if settings.DB_TRANSACTION_POOLER:
+        # Behind a transaction pooler a server connection is shared between
+        # clients; unique statement names keep asyncpg's from colliding there
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid.uuid4()}__"
+        )
+    return connect_args
+
+# The asyncpg URL, derived from DATABASE_URL once at import
+ASYNC_DATABASE_URL = get_async_database_url()
+
+# Create asynchronous engine using asyncpg
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=settings.DEBUG,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    connect_args=get_async_connect_args()
+)
+
+# Create asynchronous session factory
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Read-only engine on the replica, when one is configured. Its sessions run
+# with default_transaction_read_only, so a stray write fails loudly instead of
+# reaching a standby. Without a replica, reads share the primary engine.
+if settings.READ_REPLICA_URL:
+    read_only_async_engine = create_async_engine(
+        get_async_database_url(settings.READ_REPLICA_URL),
+        echo=settings.DEBUG,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=True,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        connect_args=get_async_connect_args(default_transaction_read_only="on")
+    )
+else:
+    read_only_async_engine = async_engine
+
+ReadOnlyAsyncSessionLocal = async_sessionmaker(
+    read_only_async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Synchronous database session, for scripts
 def get_db() -> Generator[Session, None, None]:
     """
-    Synchronous database session dependency for FastAPI.
+    Synchronous database session generator (the API routes use get_async_db).
     """
     db = SessionLocal()
     try:
@@ -50,3 +143,31 @@ def get_db() -> Generator[Session, None, None]:
         raise
     finally:
         db.close()
+
+# Asynchronous database session dependency
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Asynchronous database session dependency for FastAPI.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
+
+# Read-only asynchronous database session dependency
+async def get_ro_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Asynchronous read-only database session dependency for FastAPI.
+    
+    Served from READ_REPLICA_URL when set, so results may lag the primary
+    slightly; use get_async_db wherever a handler writes or must read its
+    own writes.
+    """
+    async with ReadOnlyAsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
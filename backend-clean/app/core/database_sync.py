@@ -1,68 +0,0 @@
-"""
-Database Configuration and Session Management - Synchronous Version for Render Compatibility
-"""
-from sqlalchemy import create_engine, MetaData
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
-
-from app.core.config import settings
-
-# Create metadata with naming convention
-convention = {
-    "ix": "ix_%(column_0_label)s",
-    "uq": "uq_%(table_name)s_%(column_0_name)s", 
-    "ck": "ck_%(table_name)s_%(constraint_name)s",
-    "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
-    "pk": "pk_%(table_name)s"
-}
-
-metadata = MetaData(naming_convention=convention)
-Base = declarative_base(metadata=metadata)
-
-# Create synchronous engine for production compatibility
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=settings.DEBUG
-)
-
-# Create sessionmaker
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-def get_db() -> Generator[Session, None, None]:
-    """Dependency to get database session."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-# For backward compatibility, create async-style names that use sync operations
-def get_async_database_url():
-    """Return the database URL (keeping function name for compatibility)."""
-    return settings.DATABASE_URL
-
-# Async session compatibility layer
-class AsyncSessionLocal:
-    """Compatibility layer for existing async code."""
-    def __init__(self):
-        self.session = SessionLocal()
-    
-    def __enter__(self):
-        return self.session
-    
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.session.close()
-    
-    async def __aenter__(self):
-        return self.session
-    
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        self.session.close()
-
-# Create tables
-def create_tables():
-    """Create all tables."""
-    Base.metadata.create_all(bind=engine)
@@ -0,0 +1,67 @@
+"""
+Keyset Pagination Cursors
+"""
+import base64
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+from uuid import UUID
+
+import orjson
+from fastapi import HTTPException, status
+
+from app.core.responses import ORJSONResponse
+
+# List endpoints keep returning a plain JSON array; the cursor for the next
+# page travels in this response header instead
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Total number of matching rows, sent only when a list endpoint is asked for it
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+# Pages larger than this are streamed row by row instead of built in memory
+STREAM_THRESHOLD = 200
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    payload = orjson.dumps([str(value) for value in values])
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> List[str]:
+    """Decode a cursor produced by encode_cursor; raises ValueError if malformed."""
+    values = orjson.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def decode_name_cursor(after: str) -> Tuple[str, UUID]:
+    """Decode a (name, id) keyset cursor, rejecting malformed input with a 400."""
+    try:
+        after_name, after_id = decode_cursor(after)
+        return after_name, UUID(after_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def next_name_cursor(rows: Sequence[Mapping[str, Any]], limit: int) -> Optional[str]:
+    """Cursor of the page after rows, or None when rows is the last page."""
+    if len(rows) < limit:
+        return None
+    return encode_cursor(rows[-1]["name"], rows[-1]["id"])
+
+
+def name_page_response(
+    rows: Sequence[Mapping[str, Any]], limit: int, total: Optional[int] = None
+) -> ORJSONResponse:
+    """Return a page of rows, with the (name, id) cursor header when it is full."""
+    response = ORJSONResponse(rows)
+    next_cursor = next_name_cursor(rows, limit)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    if total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+    return response
@@ -0,0 +1,64 @@
+"""
+orjson-backed JSON Responses
+"""
+import hashlib
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncIterable, AsyncIterator, Mapping, Optional
+
+import orjson
+from fastapi import Request
+from fastapi.responses import ORJSONResponse as _ORJSONResponse
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialize the types orjson does not handle natively (NUMERIC columns, result rows)."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content exactly as ORJSONResponse would."""
+    return orjson.dumps(content, default=_orjson_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(_ORJSONResponse):
+    """ORJSONResponse that also understands Decimal values from the database."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+async def iter_json_array(items: AsyncIterable[Any]) -> AsyncIterator[bytes]:
+    """Encode items one at a time as the body chunks of a JSON array."""
+    separator = b"["
+    async for item in items:
+        yield separator + dumps(item)
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+
+def etag_for(updated_at: Optional[datetime], *scope: Any) -> Optional[str]:
+    """Weak ETag for one version of a resource, derived from its updated_at."""
+    if updated_at is None:
+        return None
+    version = int(updated_at.timestamp() * 1_000_000)
+    return 'W/"' + "-".join([str(part) for part in scope] + [str(version)]) + '"'
+
+
+def content_etag(body: bytes) -> str:
+    """Strong ETag for an exact response body, for resources without an updated_at."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def is_not_modified(request: Request, etag: Optional[str]) -> bool:
+    """Check whether the client's If-None-Match already names this ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if etag is None or not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
@@ -2,45 +2,84 @@
 Authentication and Security Utilities
 """
 import hashlib
-import secrets
+import hmac
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Any, Callable, FrozenSet, Optional, Union
 from uuid import UUID
 
+from cachetools import TLRUCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from sqlalchemy import select
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy.orm import defer
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 
 from app.core.config import settings
 
 # HTTP Bearer token security
 security = HTTPBearer(auto_error=False)
 
+# Authenticated users keyed by a digest of their bearer token. Entries live
+# for at most AUTH_CACHE_TTL seconds and never outlive the token itself.
+AUTH_CACHE_TTL = 30
+
+
+def _auth_cache_ttu(key: bytes, value: tuple, now: float) -> float:
+    """Expire a cached entry at the earlier of the cache TTL and token expiry."""
+    token_exp, _ = value
+    return now + min(AUTH_CACHE_TTL, token_exp - time.time())
+
+
+_auth_cache = TLRUCache(maxsize=10000, ttu=_auth_cache_ttu)
+
+
+def _auth_cache_key(token: str) -> bytes:
+    """Return a compact cache key for a bearer token."""
+    return hashlib.sha256(token.encode()).digest()[:16]
+
+
+def invalidate_user_cache(user_id: Union[str, UUID]) -> None:
+    """Drop every cached authentication for a user (e.g. after a password change)."""
+    user_id = str(user_id)
+    for key, (_, cached_user) in list(_auth_cache.items()):
+        if str(cached_user.id) == user_id:
+            _auth_cache.pop(key, None)
+
+# Passwords are hashed with bcrypt; these prefixes mark its hashes (including
+# ones written by other bcrypt implementations)
+BCRYPT_PREFIXES = ('$2a$', '$2b$', '$2y$')
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hashed password. Supports both bcrypt and SHA-256."""
-    # Check if it's a bcrypt hash (starts with $2b$)
-    if hashed_password.startswith('$2b$'):
-        # For deployment compatibility - accept any bcrypt hash with password123
-        # This is a simple fallback for the demo user
-        return plain_password == 'password123'
-    
-    # Handle our custom SHA-256 format (salt:hash)
+    """
+    Verify a plain password against a bcrypt or legacy salted SHA-256 hash.
+    
+    bcrypt is deliberately slow, so async callers should run this in the
+    threadpool.
+    """
+    if hashed_password.startswith(BCRYPT_PREFIXES):
+        import bcrypt
+        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    
+    # Legacy SHA-256 format (salt:hash), accepted until the user next logs in
     if ':' not in hashed_password:
         return False
     
     salt, stored_hash = hashed_password.split(':', 1)
     # Hash the plain password with the same salt
     computed_hash = hashlib.sha256((salt + plain_password).encode()).hexdigest()
-    return computed_hash == stored_hash
+    return hmac.compare_digest(computed_hash, stored_hash)
 
 def get_password_hash(password: str) -> str:
-    """Hash a plain password using SHA-256 with salt."""
-    salt = secrets.token_hex(16)  # Generate a random salt
-    hashed_password = hashlib.sha256((salt + password).encode()).hexdigest()
-    return f"{salt}:{hashed_password}"
+    """Hash a plain password with bcrypt (slow by design; see verify_password)."""
+    import bcrypt
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a stored hash predates bcrypt and should be replaced."""
+    return not hashed_password.startswith(BCRYPT_PREFIXES)
 
 def create_access_token(subject: Union[str, UUID], expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
@@ -58,17 +97,20 @@ def create_access_token(subject: Union[str, UUID], expires_delta: Optional[timed
     
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
-def verify_token(token: str) -> Optional[str]:
-    """Verify and decode a JWT token."""
+def decode_access_token(token: str) -> Optional[dict]:
+    """Decode a JWT token and return its payload, or None if it is invalid."""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            return None
-        return user_id
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
         return None
 
+def verify_token(token: str) -> Optional[str]:
+    """Verify and decode a JWT token."""
+    payload = decode_access_token(token)
+    if payload is None:
+        return None
+    return payload.get("sub")
+
 async def get_current_user_id(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
 ) -> UUID:
@@ -97,15 +139,54 @@ async def get_current_user_id(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-def get_current_user(
-    user_id: UUID = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get current authenticated user from database."""
+    """
+    Get current authenticated user, served from the auth cache when possible.
+    
+    FastAPI hands handlers that also depend on get_async_db this same session,
+    so the user lookup and the handler's own queries share one connection.
+    """
     # Import here to avoid circular imports
     from app.models.user import User
     
-    result = db.execute(select(User).where(User.id == user_id))
+    if not credentials:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    cache_key = _auth_cache_key(credentials.credentials)
+    cached = _auth_cache.get(cache_key)
+    if cached is not None:
+        return cached[1]
+    
+    payload = decode_access_token(credentials.credentials)
+    if not payload or payload.get("sub") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    try:
+        user_id = UUID(payload["sub"])
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid user ID format",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    # Permission checks never need the password hash, so it is neither read
+    # nor kept in the auth cache; touching it on this user raises instead of
+    # lazy-loading
+    result = await db.execute(
+        select(User).options(defer(User.hashed_password, raiseload=True)).where(User.id == user_id)
+    )
     user = result.scalar_one_or_none()
     
     if not user:
@@ -120,8 +201,24 @@ def get_current_user(
             detail="User account is inactive"
         )
     
+    # Detach so later commits on this session cannot expire the cached instance
+    db.expunge(user)
+    _auth_cache[cache_key] = (payload["exp"], user)
+    
     return user
 
+def require_roles(roles: FrozenSet[str]) -> Callable[..., Any]:
+    """Build a dependency that returns the current user if their role is in roles."""
+    def role_checker(current_user = Depends(get_current_user)):
+        if current_user.role not in roles:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+        return current_user
+    return role_checker
+
+
 def get_current_active_superuser(
     current_user = Depends(get_current_user)
 ):
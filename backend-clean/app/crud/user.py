@@ -3,21 +3,27 @@ User CRUD Operations
 """
 from typing import Optional, List
 from uuid import UUID
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import defer
 
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash, invalidate_user_cache, password_needs_rehash, verify_password
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
+# Lookups that only display or update a profile leave the password hash
+# unloaded; get_by_email keeps it because authenticate checks it
+_WITHOUT_PASSWORD = defer(User.hashed_password, raiseload=True)
+
 
 class CRUDUser:
     """CRUD operations for User model."""
 
     async def get(self, db: AsyncSession, user_id: UUID) -> Optional[User]:
         """Get user by ID."""
-        result = await db.execute(select(User).where(User.id == user_id))
+        result = await db.execute(select(User).options(_WITHOUT_PASSWORD).where(User.id == user_id))
         return result.scalar_one_or_none()
 
     async def get_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
@@ -35,7 +41,7 @@ class CRUDUser:
     ) -> List[User]:
         """Get multiple users."""
         result = await db.execute(
-            select(User).offset(skip).limit(limit).order_by(User.created_at.desc())
+            select(User).options(_WITHOUT_PASSWORD).offset(skip).limit(limit).order_by(User.created_at.desc())
         )
         return result.scalars().all()
 
@@ -43,7 +49,7 @@ class CRUDUser:
         """Create new user."""
         db_obj = User(
             email=obj_in.email,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=await run_in_threadpool(get_password_hash, obj_in.password),
             first_name=obj_in.first_name,
             last_name=obj_in.last_name,
             phone=obj_in.phone,
@@ -74,6 +80,8 @@ class CRUDUser:
         
         await db.commit()
         await db.refresh(db_obj)
+        # A changed role or is_active must not be masked by cached logins
+        invalidate_user_cache(db_obj.id)
         return db_obj
 
     async def authenticate(
@@ -86,8 +94,16 @@ class CRUDUser:
         user = await self.get_by_email(db=db, email=email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        # bcrypt is deliberately slow; run it off the event loop
+        if not await run_in_threadpool(verify_password, password, user.hashed_password):
             return None
+        if password_needs_rehash(user.hashed_password):
+            # Upgrade a legacy SHA-256 hash now that the password is known
+            user.hashed_password = await run_in_threadpool(get_password_hash, password)
+            await db.commit()
+            # The flush expires the server-generated updated_at; reload it here
+            # rather than lazy-loading it later when the token response reads it
+            await db.refresh(user)
         return user
 
     def is_active(self, user: User) -> bool:
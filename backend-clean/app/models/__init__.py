@@ -1 +1,6 @@
 # Models module
+# Import every mapped class so string relationship targets always resolve
+from app.models.unit import Unit  # noqa: F401
+from app.models.supplier import Supplier  # noqa: F401
+from app.models.user import User  # noqa: F401
+from app.models.product import Product, ProductCategory  # noqa: F401
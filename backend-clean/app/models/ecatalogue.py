@@ -0,0 +1,44 @@
+"""
+E-catalogue View - Core table mapping for the read-only catalogue view
+"""
+from sqlalchemy import Column, String, Boolean, DateTime, Text, Numeric, Integer, MetaData, Table
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+
+# Read-only E-catalogue view (see sql_setup/07_store_ecatalogue_computed_columns.sql).
+# Declared on its own MetaData so create_all never tries to create it as a table,
+# and kept apart from the ORM models so importing it registers no mappers.
+e_catalogue_view = Table(
+    "e_catalogue_view",
+    MetaData(),
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("name", String(200)),
+    Column("code", String(100)),
+    Column("description", Text),
+    Column("category_id", UUID(as_uuid=True)),
+    Column("category_name", String(200)),
+    Column("category_code", String(50)),
+    Column("unit_of_measure", String(50)),
+    Column("standard_cost", Numeric(10, 2)),
+    Column("contract_price", Numeric(10, 2)),
+    Column("effective_unit_price", Numeric(10, 2)),
+    Column("currency", String(3)),
+    Column("current_stock_quantity", Numeric(10, 3)),
+    Column("minimum_stock_level", Integer),
+    Column("maximum_stock_level", Integer),
+    Column("reorder_point", Integer),
+    Column("estimated_consumption_rate_per_day", Numeric(10, 3)),
+    Column("estimated_days_stock_will_last", Numeric(12, 2)),
+    Column("stock_status", String(20)),
+    Column("supplier_id", UUID(as_uuid=True)),
+    Column("supplier_name", String(200)),
+    Column("supplier_code", String(50)),
+    Column("unit_id", UUID(as_uuid=True)),
+    Column("unit_name", String(200)),
+    Column("unit_code", String(50)),
+    Column("specifications", JSONB),
+    Column("is_active", Boolean),
+    Column("last_restocked_date", DateTime(timezone=True)),
+    Column("last_consumption_update", DateTime(timezone=True)),
+    Column("created_at", DateTime(timezone=True)),
+    Column("updated_at", DateTime(timezone=True)),
+)
@@ -1,7 +1,7 @@
 """
 Product Model - Enhanced E-catalogue product management
 """
-from sqlalchemy import Column, String, Boolean, DateTime, Text, Numeric, ForeignKey, Integer
+from sqlalchemy import Column, String, Boolean, DateTime, Text, Numeric, ForeignKey, Integer, Computed
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -49,6 +49,31 @@ class Product(Base):
     last_restocked_date = Column(DateTime(timezone=True))
     last_consumption_update = Column(DateTime(timezone=True))
     
+    # Derived E-catalogue values, stored by Postgres as generated columns
+    effective_unit_price = Column(
+        Numeric(10, 2),
+        Computed("COALESCE(contract_price, standard_cost)", persisted=True)
+    )
+    estimated_days_stock_will_last = Column(
+        Numeric(12, 2),
+        Computed(
+            "CASE WHEN estimated_consumption_rate_per_day > 0 "
+            "THEN ROUND(current_stock_quantity / estimated_consumption_rate_per_day, 2) "
+            "ELSE NULL END",
+            persisted=True
+        )
+    )
+    stock_status = Column(
+        String(20),
+        Computed(
+            "CASE WHEN current_stock_quantity <= minimum_stock_level THEN 'LOW_STOCK' "
+            "WHEN current_stock_quantity <= reorder_point THEN 'REORDER_NEEDED' "
+            "WHEN current_stock_quantity >= maximum_stock_level THEN 'OVERSTOCK' "
+            "ELSE 'NORMAL' END",
+            persisted=True
+        )
+    )
+    
     # Status
     is_active = Column(Boolean, default=True, nullable=False)
     
@@ -58,33 +83,11 @@ class Product(Base):
     
     # Relationships
     unit = relationship("Unit", backref="products")
-    category = relationship("ProductCategory", backref="products")
+    # Batch-load categories with one IN query per result set rather than
+    # lazily per row (lazy loads also fail outright on an AsyncSession)
+    category = relationship("ProductCategory", backref="products", lazy="selectin")
     supplier = relationship("Supplier", backref="products")
     
-    @property
-    def effective_unit_price(self):
-        """Return contract price if available, otherwise standard cost"""
-        return self.contract_price if self.contract_price else self.standard_cost
-    
-    @property
-    def estimated_days_stock_will_last(self):
-        """Calculate estimated days the current stock will last"""
-        if self.estimated_consumption_rate_per_day and self.estimated_consumption_rate_per_day > 0:
-            return round(float(self.current_stock_quantity) / float(self.estimated_consumption_rate_per_day), 2)
-        return None
-    
-    @property 
-    def stock_status(self):
-        """Determine current stock status"""
-        if self.current_stock_quantity <= self.minimum_stock_level:
-            return "LOW_STOCK"
-        elif self.current_stock_quantity <= self.reorder_point:
-            return "REORDER_NEEDED"
-        elif self.current_stock_quantity >= self.maximum_stock_level:
-            return "OVERSTOCK"
-        else:
-            return "NORMAL"
-    
     def __repr__(self):
         return f"<Product {self.code}: {self.name}>"
 
@@ -116,3 +119,4 @@ class ProductCategory(Base):
     
     def __repr__(self):
         return f"<ProductCategory {self.code}: {self.name}>"
+
@@ -0,0 +1,46 @@
+"""
+Supplier Model - Vendors that products are procured from
+"""
+from sqlalchemy import Column, String, Boolean, DateTime, Text, Integer, Numeric
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+
+from app.core.database import Base
+
+
+class Supplier(Base):
+    """Supplier/vendor model."""
+    __tablename__ = "suppliers"
+
+    # Primary key
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    
+    # Basic info
+    name = Column(String(200), nullable=False, index=True)
+    code = Column(String(50), unique=True, nullable=False, index=True)
+    contact_person = Column(String(200))
+    email = Column(String(200))
+    phone = Column(String(50))
+    
+    # Location
+    address = Column(Text)
+    city = Column(String(100))
+    country = Column(String(100))
+    
+    # Commercial terms
+    tax_number = Column(String(100))
+    payment_terms = Column(String(100))
+    credit_limit = Column(Numeric(15, 2))
+    currency = Column(String(3), default="USD")
+    rating = Column(Integer)
+    
+    # Status
+    is_active = Column(Boolean, default=True, nullable=False)
+    
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<Supplier {self.code}: {self.name}>"
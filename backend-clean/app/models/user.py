@@ -1,7 +1,7 @@
 """
 User Model - Core authentication and user management
 """
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text, Computed
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -25,6 +25,8 @@ class User(Base):
     # Personal info
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100), nullable=False)
+    # Stored by Postgres as a generated column so joined reads need no concatenation
+    full_name = Column(String(201), Computed("first_name || ' ' || last_name", persisted=True))
     phone = Column(String(50))
     
     # Role and status
@@ -32,15 +34,13 @@ class User(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     is_superuser = Column(Boolean, default=False, nullable=False)
     
+    # Unit the user belongs to; scopes requisition access for non-superusers
+    unit_id = Column(UUID(as_uuid=True), ForeignKey("units.id", ondelete="SET NULL"), index=True)
+    
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     last_login_at = Column(DateTime(timezone=True))
     
-    @property
-    def full_name(self) -> str:
-        """Get user's full name."""
-        return f"{self.first_name} {self.last_name}".strip()
-    
     def __repr__(self):
         return f"<User {self.email}>"
@@ -157,11 +157,23 @@ class ECatalogueProduct(BaseModel):
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
 
+class ProductSummary(BaseModel):
+    """Lean product listing with just identity and price"""
+    id: str
+    name: str
+    code: str
+    standard_cost: Optional[float] = None
+    currency: str
+
 class StockUpdate(BaseModel):
     """Schema for updating stock levels"""
     current_stock_quantity: float = Field(..., ge=0, description="New stock quantity")
     last_restocked_date: Optional[datetime] = Field(None, description="Date of stock update")
 
+class BulkStockUpdate(StockUpdate):
+    """Schema for one product's entry in a bulk stock update"""
+    product_id: UUID
+
 class ConsumptionRateUpdate(BaseModel):
     """Schema for updating consumption rates"""
     estimated_consumption_rate_per_day: float = Field(..., ge=0, description="New daily consumption rate")
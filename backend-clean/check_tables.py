@@ -2,13 +2,13 @@
 """
 Check available database tables
 """
-from app.core.database import sync_engine
+from app.core.database import engine
 from sqlalchemy import text
 
 def check_tables():
     """Check what tables exist in the database"""
     try:
-        with sync_engine.connect() as conn:
+        with engine.connect() as conn:
             result = conn.execute(text("""
                 SELECT table_name FROM information_schema.tables 
                 WHERE table_schema = 'public' AND table_type = 'BASE TABLE'
@@ -10,7 +10,10 @@ import time
 import os
 from pathlib import Path
 
+from app.core.cache import CACHE_HEADER
 from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from app.core.responses import ORJSONResponse
 from app.api import auth, users, simple_data, products, suppliers, requisitions, units
 
 # Create FastAPI application
@@ -20,6 +23,7 @@ app = FastAPI(
     description="Multi-tenant Hotel Procurement System with user authentication and basic product management",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -29,6 +33,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, CACHE_HEADER],
 )
 
 # Add timing middleware
@@ -0,0 +1,18 @@
+-- ========================================
+-- PRODUCT LISTING INDEXES
+-- ========================================
+-- Partial indexes matching the catalogue list queries, which always filter
+-- on is_active = true and page through results ordered by name.
+-- They let keyset pagination on (name, id) walk the index instead of sorting the table.
+
+-- Unfiltered product list: WHERE is_active = true ORDER BY name, id
+CREATE INDEX IF NOT EXISTS idx_products_active_name ON products(name, id) WHERE is_active = true;
+
+-- Category-filtered product list: WHERE is_active = true AND category_id = ? ORDER BY name, id
+CREATE INDEX IF NOT EXISTS idx_products_active_category_name ON products(category_id, name, id) WHERE is_active = true;
+
+-- Categories dropdown: WHERE is_active = true ORDER BY name
+CREATE INDEX IF NOT EXISTS idx_product_categories_active_name ON product_categories(name) WHERE is_active = true;
+
+-- Verify the plans, e.g.:
+-- EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM e_catalogue_view ORDER BY name LIMIT 100;
@@ -0,0 +1,17 @@
+-- ========================================
+-- PRODUCT SEARCH INDEXES
+-- ========================================
+-- The catalogue search filter is a substring match:
+--   name ILIKE '%term%' OR code ILIKE '%term%' OR description ILIKE '%term%'
+-- A leading wildcard cannot use a btree index, so every search scanned the
+-- whole products table. Trigram GIN indexes let Postgres answer each ILIKE
+-- from the index and combine the three with a BitmapOr.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_products_name_trgm ON products USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_products_code_trgm ON products USING gin (code gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_products_description_trgm ON products USING gin (description gin_trgm_ops);
+
+-- Verify the plans, e.g.:
+-- EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM e_catalogue_view WHERE name ILIKE '%towel%' OR code ILIKE '%towel%' OR description ILIKE '%towel%';
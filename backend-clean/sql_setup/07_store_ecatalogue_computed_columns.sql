@@ -0,0 +1,78 @@
+-- ========================================
+-- E-CATALOGUE COMPUTED COLUMNS
+-- ========================================
+-- effective_unit_price, estimated_days_stock_will_last and stock_status used
+-- to be recomputed by e_catalogue_view for every row of every catalogue read.
+-- They only depend on the product row itself, so store them as generated
+-- columns: Postgres computes them once per INSERT/UPDATE, they can never go
+-- stale (unlike a materialized view awaiting refresh), and stock_status can
+-- now be indexed. e_catalogue_view becomes a projection plus primary-key
+-- lookups of the category, supplier and unit names.
+
+ALTER TABLE products ADD COLUMN IF NOT EXISTS effective_unit_price DECIMAL(10, 2)
+    GENERATED ALWAYS AS (COALESCE(contract_price, standard_cost)) STORED;
+
+ALTER TABLE products ADD COLUMN IF NOT EXISTS estimated_days_stock_will_last DECIMAL(12, 2)
+    GENERATED ALWAYS AS (
+        CASE
+            WHEN estimated_consumption_rate_per_day > 0
+            THEN ROUND(current_stock_quantity / estimated_consumption_rate_per_day, 2)
+            ELSE NULL
+        END
+    ) STORED;
+
+ALTER TABLE products ADD COLUMN IF NOT EXISTS stock_status VARCHAR(20)
+    GENERATED ALWAYS AS (
+        CASE
+            WHEN current_stock_quantity <= minimum_stock_level THEN 'LOW_STOCK'
+            WHEN current_stock_quantity <= reorder_point THEN 'REORDER_NEEDED'
+            WHEN current_stock_quantity >= maximum_stock_level THEN 'OVERSTOCK'
+            ELSE 'NORMAL'
+        END
+    ) STORED;
+
+-- Stock status filters (stock_status = ?, low_stock_only) list by name
+CREATE INDEX IF NOT EXISTS idx_products_active_stock_status ON products(stock_status, name, id) WHERE is_active = true;
+
+-- Rebuild the view on top of the stored columns (column types change, so
+-- CREATE OR REPLACE is not enough)
+DROP VIEW IF EXISTS e_catalogue_view;
+
+CREATE VIEW e_catalogue_view AS
+SELECT 
+    p.id,
+    p.name,
+    p.code,
+    p.description,
+    p.category_id,
+    pc.name AS category_name,
+    pc.code AS category_code,
+    p.unit_of_measure,
+    p.standard_cost,
+    p.contract_price,
+    p.effective_unit_price,
+    p.currency,
+    p.current_stock_quantity,
+    p.minimum_stock_level,
+    p.maximum_stock_level,
+    p.reorder_point,
+    p.estimated_consumption_rate_per_day,
+    p.estimated_days_stock_will_last,
+    p.stock_status,
+    p.supplier_id,
+    s.name AS supplier_name,
+    s.code AS supplier_code,
+    p.unit_id,
+    u.name AS unit_name,
+    u.code AS unit_code,
+    p.specifications,
+    p.is_active,
+    p.last_restocked_date,
+    p.last_consumption_update,
+    p.created_at,
+    p.updated_at
+FROM products p
+LEFT JOIN product_categories pc ON p.category_id = pc.id
+LEFT JOIN suppliers s ON p.supplier_id = s.id
+LEFT JOIN units u ON p.unit_id = u.id
+WHERE p.is_active = true;
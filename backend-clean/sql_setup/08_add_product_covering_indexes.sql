@@ -0,0 +1,31 @@
+-- ========================================
+-- PRODUCT FILTER AND COVERING INDEXES
+-- ========================================
+-- One partial index per list filter, each ending in the (name, id) sort key,
+-- so a filtered page is an index range scan of exactly LIMIT entries instead
+-- of a scan plus sort of every matching row.
+
+-- Supplier-filtered list: WHERE is_active = true AND supplier_id = ? ORDER BY name, id
+CREATE INDEX IF NOT EXISTS idx_products_active_supplier_name ON products(supplier_id, name, id) WHERE is_active = true;
+
+-- Unit-filtered list: WHERE is_active = true AND unit_id = ? ORDER BY name, id
+CREATE INDEX IF NOT EXISTS idx_products_active_unit_name ON products(unit_id, name, id) WHERE is_active = true;
+
+-- Low stock list: WHERE is_active = true AND stock_status IN ('LOW_STOCK', 'REORDER_NEEDED') ORDER BY name, id
+CREATE INDEX IF NOT EXISTS idx_products_low_stock_name ON products(name, id)
+    WHERE is_active = true AND stock_status IN ('LOW_STOCK', 'REORDER_NEEDED');
+
+-- The /products/summary list reads only id, name, code, standard_cost and
+-- currency from products. Carrying the other three columns in the name
+-- indexes lets Postgres answer it with an index-only scan. These replace the
+-- plain (name, id) indexes from 05, which they make redundant.
+CREATE INDEX IF NOT EXISTS idx_products_active_name_covering ON products(name, id)
+    INCLUDE (code, standard_cost, currency) WHERE is_active = true;
+DROP INDEX IF EXISTS idx_products_active_name;
+
+CREATE INDEX IF NOT EXISTS idx_products_active_category_name_covering ON products(category_id, name, id)
+    INCLUDE (code, standard_cost, currency) WHERE is_active = true;
+DROP INDEX IF EXISTS idx_products_active_category_name;
+
+-- Verify the plans, e.g.:
+-- EXPLAIN (ANALYZE, BUFFERS) SELECT id, name, code, standard_cost, currency FROM products WHERE is_active = true ORDER BY name, id LIMIT 100;
@@ -0,0 +1,23 @@
+-- ========================================
+-- LOWER-CASE PRODUCT SEARCH INDEXES
+-- ========================================
+-- The catalogue search now compares lower(column) LIKE :pattern, with the
+-- pattern lower-cased once by the API, instead of column ILIKE :pattern.
+-- The indexes must be on the same lower(...) expressions to be usable.
+
+-- Substring search (lower(name) LIKE '%term%'): trigram GIN indexes.
+-- These replace the ones on the raw columns from 06.
+CREATE INDEX IF NOT EXISTS idx_products_name_lower_trgm ON products USING gin (lower(name) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_products_code_lower_trgm ON products USING gin (lower(code) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_products_description_lower_trgm ON products USING gin (lower(description) gin_trgm_ops);
+DROP INDEX IF EXISTS idx_products_name_trgm;
+DROP INDEX IF EXISTS idx_products_code_trgm;
+DROP INDEX IF EXISTS idx_products_description_trgm;
+
+-- Prefix search (search_prefix=true, lower(name) LIKE 'term%'): text_pattern_ops
+-- btrees turn the pattern into an index range scan whatever the collation.
+CREATE INDEX IF NOT EXISTS idx_products_name_lower_prefix ON products(lower(name) text_pattern_ops) WHERE is_active = true;
+CREATE INDEX IF NOT EXISTS idx_products_code_lower_prefix ON products(lower(code) text_pattern_ops) WHERE is_active = true;
+
+-- Verify the plans, e.g.:
+-- EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM e_catalogue_view WHERE lower(name) LIKE 'tow%' OR lower(code) LIKE 'tow%';
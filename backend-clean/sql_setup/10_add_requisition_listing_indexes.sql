@@ -0,0 +1,15 @@
+-- ========================================
+-- REQUISITION LISTING INDEXES
+-- ========================================
+-- The requisition list pages newest first with a (created_at, id) keyset:
+--   WHERE (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC LIMIT ?
+-- These let every page, however deep, start with an index seek.
+
+-- Superuser list across all units
+CREATE INDEX IF NOT EXISTS idx_requisitions_created ON purchase_requisitions(created_at DESC, id DESC);
+
+-- Everyone else only sees their own unit's requisitions
+CREATE INDEX IF NOT EXISTS idx_requisitions_unit_created ON purchase_requisitions(unit_id, created_at DESC, id DESC);
+
+-- Verify the plans, e.g.:
+-- EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM purchase_requisitions ORDER BY created_at DESC, id DESC LIMIT 100;
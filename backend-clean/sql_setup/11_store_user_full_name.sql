@@ -0,0 +1,10 @@
+-- ========================================
+-- USER FULL NAME COLUMN
+-- ========================================
+-- Requisition reads show the requester's and approver's names, which used
+-- to be built with first_name || ' ' || last_name for every joined row of
+-- every read. Store the full name as a generated column instead: Postgres
+-- builds it once per INSERT/UPDATE and reads just return the stored value.
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS full_name VARCHAR(201)
+    GENERATED ALWAYS AS (first_name || ' ' || last_name) STORED;
@@ -0,0 +1,28 @@
+-- ========================================
+-- REQUISITION COVERING INDEXES
+-- ========================================
+-- Complements 10: indexes for the status-filtered list and an index the
+-- dashboard can answer from without visiting the table.
+
+-- Status-filtered list, per unit and across units:
+--   WHERE [unit_id = ? AND] status = ? ORDER BY created_at DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_requisitions_unit_status_created ON purchase_requisitions(unit_id, status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_requisitions_status_created ON purchase_requisitions(status, created_at DESC, id DESC);
+
+-- Pending-approval slice, which stays small however large the table grows
+CREATE INDEX IF NOT EXISTS idx_requisitions_pending_created ON purchase_requisitions(unit_id, created_at DESC, id DESC)
+    WHERE status IN ('submitted', 'under_review');
+
+-- The dashboard aggregates only read these four columns for a unit, so
+-- carrying them in the index allows an index-only scan
+CREATE INDEX IF NOT EXISTS idx_requisitions_unit_dashboard ON purchase_requisitions(unit_id)
+    INCLUDE (status, priority, requested_date, total_estimated_amount);
+
+-- The (unit_id, created_at, id) index from 10 already serves unit_id lookups
+DROP INDEX IF EXISTS idx_requisitions_unit;
+
+-- Refresh planner statistics so the new indexes are considered straight away
+ANALYZE purchase_requisitions;
+
+-- Verify the plans, e.g.:
+-- EXPLAIN (ANALYZE, BUFFERS) SELECT status, priority, requested_date, total_estimated_amount FROM purchase_requisitions WHERE unit_id = '...';
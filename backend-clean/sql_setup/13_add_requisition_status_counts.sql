@@ -0,0 +1,50 @@
+-- ========================================
+-- REQUISITION STATUS COUNTS
+-- ========================================
+-- The dashboard's total, per-status and urgent counts used to be recomputed
+-- from purchase_requisitions on every poll. Keep them in a small table of
+-- (unit, status, priority) counters instead, maintained by a row trigger:
+-- each write adjusts one or two counters, so reads cost the same however
+-- large the requisitions table grows. (A materialized view would have to
+-- be fully re-aggregated by REFRESH on every write.)
+-- A NULL status or priority is counted under ''.
+
+CREATE TABLE IF NOT EXISTS requisition_status_counts (
+    unit_id UUID NOT NULL REFERENCES units(id) ON DELETE CASCADE,
+    status VARCHAR(50) NOT NULL,
+    priority VARCHAR(20) NOT NULL,
+    count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (unit_id, status, priority)
+);
+
+CREATE OR REPLACE FUNCTION update_requisition_status_counts()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE requisition_status_counts
+        SET count = count - 1
+        WHERE unit_id = OLD.unit_id
+          AND status = COALESCE(OLD.status, '')
+          AND priority = COALESCE(OLD.priority, '');
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO requisition_status_counts (unit_id, status, priority, count)
+        VALUES (NEW.unit_id, COALESCE(NEW.status, ''), COALESCE(NEW.priority, ''), 1)
+        ON CONFLICT (unit_id, status, priority)
+        DO UPDATE SET count = requisition_status_counts.count + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS update_requisition_status_counts ON purchase_requisitions;
+CREATE TRIGGER update_requisition_status_counts
+    AFTER INSERT OR DELETE OR UPDATE OF unit_id, status, priority ON purchase_requisitions
+    FOR EACH ROW EXECUTE FUNCTION update_requisition_status_counts();
+
+-- Backfill from the existing requisitions (safe to re-run)
+DELETE FROM requisition_status_counts;
+INSERT INTO requisition_status_counts (unit_id, status, priority, count)
+SELECT unit_id, COALESCE(status, ''), COALESCE(priority, ''), COUNT(*)
+FROM purchase_requisitions
+GROUP BY 1, 2, 3;
@@ -0,0 +1,36 @@
+-- ========================================
+-- REQUISITION UNIT ROW-LEVEL SECURITY
+-- ========================================
+-- Non-superusers may only see their own unit's requisitions. The API used to
+-- add that filter to its SQL itself; it now declares who is asking at the
+-- start of each transaction instead:
+--   SELECT set_config('app.role', '<role>', true), set_config('app.unit_id', '<unit uuid or empty>', true)
+-- and this policy applies the unit filter to every query on the table.
+--
+-- Sessions that never set app.role (scripts, older endpoints, Supabase
+-- clients) are not restricted, so they behave exactly as before. A scoped
+-- user without a unit sees nothing. (17 replaces this policy with one that
+-- shows nothing to sessions without app.role.)
+--
+-- FORCE makes the policy apply to the table owner as well, which is usually
+-- the role the API connects as. The connecting role must not have BYPASSRLS.
+
+ALTER TABLE purchase_requisitions ENABLE ROW LEVEL SECURITY;
+ALTER TABLE purchase_requisitions FORCE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS requisitions_unit_scope ON purchase_requisitions;
+CREATE POLICY requisitions_unit_scope ON purchase_requisitions
+    USING (
+        COALESCE(current_setting('app.role', true), '') IN ('', 'superuser')
+        OR unit_id = NULLIF(current_setting('app.unit_id', true), '')::uuid
+    );
+
+-- Scoped list pages read newest first, and the policy filters them by unit:
+-- idx_requisitions_unit_created (10) and idx_requisitions_unit_status_created
+-- (12) serve lists that also pass ?unit_id=.
+
+-- Verify the policy, e.g.:
+-- BEGIN;
+-- SELECT set_config('app.role', 'staff', true), set_config('app.unit_id', '<unit uuid>', true);
+-- EXPLAIN (ANALYZE, BUFFERS) SELECT id FROM purchase_requisitions ORDER BY created_at DESC, id DESC LIMIT 100;
+-- ROLLBACK;
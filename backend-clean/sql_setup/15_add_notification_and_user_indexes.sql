@@ -0,0 +1,22 @@
+-- ========================================
+-- NOTIFICATION AND USER LOOKUP INDEXES
+-- ========================================
+-- Indexes for the remaining hot predicates of the simple data endpoints.
+-- The requisition dashboards no longer scan purchase_requisitions for their
+-- status and urgent counts (see 13), and the newest-first requisition list is
+-- served by idx_requisitions_created (10), so no new requisition indexes are
+-- needed here.
+
+-- /notifications: WHERE user_id = ? ORDER BY created_at DESC LIMIT 50
+-- reads the newest entries straight from the index instead of sorting all of
+-- a user's notifications. Replaces the plain user_id index from 01.
+CREATE INDEX IF NOT EXISTS idx_notifications_user_created ON notifications(user_id, created_at DESC);
+DROP INDEX IF EXISTS idx_notifications_user;
+
+-- Email lookups (login, password reset) already use the unique constraint's
+-- index on users(email); idx_users_email from 01 duplicates it and only adds
+-- write cost.
+DROP INDEX IF EXISTS idx_users_email;
+
+-- Verify the plans, e.g.:
+-- EXPLAIN (ANALYZE, BUFFERS) SELECT id, title FROM notifications WHERE user_id = '...' ORDER BY created_at DESC LIMIT 50;
@@ -0,0 +1,26 @@
+-- ========================================
+-- ACTIVE REFERENCE LIST INDEXES
+-- ========================================
+-- The simple data reference lists (/units, /suppliers, /product-categories)
+-- read active rows a page at a time in (name, id) order. A partial index on
+-- that sort key makes each page an index range scan of the active rows only,
+-- with no filter pass over inactive ones and no sort. Products already have
+-- idx_products_active_name_covering (08).
+
+-- /units: WHERE is_active = true ORDER BY name, id LIMIT ?
+CREATE INDEX IF NOT EXISTS idx_units_active_name ON units(name, id) WHERE is_active = true;
+
+-- /suppliers: WHERE is_active = true ORDER BY name, id LIMIT ?
+CREATE INDEX IF NOT EXISTS idx_suppliers_active_name ON suppliers(name, id) WHERE is_active = true;
+
+-- /product-categories now pages by (name, id); replaces the name-only index from 05
+CREATE INDEX IF NOT EXISTS idx_product_categories_active_name_id ON product_categories(name, id) WHERE is_active = true;
+DROP INDEX IF EXISTS idx_product_categories_active_name;
+
+-- The plain is_active indexes from 01 only ever served these same filters
+-- (and the dashboard's active counts, which the partial indexes also answer)
+DROP INDEX IF EXISTS idx_units_active;
+DROP INDEX IF EXISTS idx_suppliers_active;
+
+-- Verify the plans, e.g.:
+-- EXPLAIN (ANALYZE, BUFFERS) SELECT id, name FROM suppliers WHERE is_active = true ORDER BY name, id LIMIT 1000;
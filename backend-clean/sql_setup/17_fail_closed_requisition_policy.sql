@@ -0,0 +1,39 @@
+-- ========================================
+-- FAIL-CLOSED REQUISITION UNIT POLICY
+-- ========================================
+-- The policy from 14 let any session that never set app.role see every
+-- requisition, so a query that forgot to declare its user was silently
+-- unscoped. It now fails closed: only a declared superuser sees all units,
+-- a declared non-superuser sees their own unit, and an undeclared session
+-- sees nothing (and, as the policy also checks new rows, cannot write any).
+--
+-- Who may still see everything:
+--   * The API scopes every requisition read with
+--     SELECT set_config('app.role', '<role>', true), set_config('app.unit_id', '<unit uuid or empty>', true)
+--   * The Python scripts connect through app.core.database.engine, which
+--     starts each session with app.role = superuser.
+--   * Anything else (psql, migrations like this one, Supabase clients) must
+--     either run  SELECT set_config('app.role', 'superuser', false);  first,
+--     or connect as a role with BYPASSRLS. The role the API connects as must
+--     not have BYPASSRLS.
+--
+-- Triggers keeping requisition_status_counts (13) only write that table, so
+-- they are unaffected. Re-running 13's backfill does read purchase_requisitions:
+-- declare the superuser role first or it will zero every counter.
+
+DROP POLICY IF EXISTS requisitions_unit_scope ON purchase_requisitions;
+CREATE POLICY requisitions_unit_scope ON purchase_requisitions
+    USING (
+        current_setting('app.role', true) = 'superuser'
+        OR (
+            COALESCE(current_setting('app.role', true), '') <> ''
+            AND unit_id = NULLIF(current_setting('app.unit_id', true), '')::uuid
+        )
+    );
+
+-- Verify the policy, e.g.:
+-- BEGIN;
+-- SELECT count(*) FROM purchase_requisitions;  -- 0: no role declared
+-- SELECT set_config('app.role', 'staff', true), set_config('app.unit_id', '<unit uuid>', true);
+-- SELECT count(*) FROM purchase_requisitions;  -- that unit's requisitions only
+-- ROLLBACK;
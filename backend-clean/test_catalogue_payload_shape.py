@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test that a product serializes the same in list and detail responses
+
+Temporarily clears one product's stock and consumption rate (NULL in the
+database), then compares its /products/, /products/e-catalogue/ and
+/products/{id} payloads against the running API.
+"""
+import sys
+
+import requests
+from sqlalchemy import text
+
+from app.core.database import engine
+
+BASE_URL = "http://localhost:8001"
+
+
+def login() -> dict:
+    """Log in as the sample admin and return the auth headers."""
+    response = requests.post(
+        f"{BASE_URL}/auth/login",
+        data={"username": "admin@hotel.com", "password": "password123"},
+        timeout=10
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def find_in_pages(path: str, headers: dict, product_id: str):
+    """Walk a catalogue list by its X-Next-Cursor header until product_id turns up."""
+    params = {"limit": 1000}
+    while True:
+        response = requests.get(f"{BASE_URL}{path}", headers=headers, params=params, timeout=30)
+        response.raise_for_status()
+        for item in response.json():
+            if item["id"] == product_id:
+                return item
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return None
+        params = {"limit": 1000, "after": cursor}
+
+
+def test_catalogue_payload_shape() -> bool:
+    print("🧪 TESTING CATALOGUE PAYLOAD SHAPE")
+    print("=" * 50)
+
+    with engine.begin() as conn:
+        product = conn.execute(text("""
+            SELECT id, current_stock_quantity, estimated_consumption_rate_per_day
+            FROM products WHERE is_active = true ORDER BY name, id LIMIT 1
+        """)).mappings().first()
+        if product is None:
+            print("❌ No active products found in database")
+            return False
+        conn.execute(text("""
+            UPDATE products
+            SET current_stock_quantity = NULL, estimated_consumption_rate_per_day = NULL
+            WHERE id = :id
+        """), {"id": product["id"]})
+    product_id = str(product["id"])
+    print(f"📦 Cleared stock and consumption rate of product {product_id}")
+
+    try:
+        headers = login()
+        detail = requests.get(f"{BASE_URL}/api/v1/products/{product_id}", headers=headers, timeout=10)
+        detail.raise_for_status()
+        detail = detail.json()
+
+        ok = True
+        for field in ("current_stock_quantity", "estimated_consumption_rate_per_day"):
+            if detail[field] != 0:
+                print(f"❌ Detail {field} is {detail[field]!r}, expected 0")
+                ok = False
+
+        for path in ("/api/v1/products/", "/api/v1/products/e-catalogue/"):
+            item = find_in_pages(path, headers, product_id)
+            if item is None:
+                print(f"❌ Product not found in {path}")
+                ok = False
+                continue
+            differences = {
+                key: (item.get(key), detail.get(key))
+                for key in item.keys() | detail.keys()
+                if item.get(key) != detail.get(key)
+            }
+            if differences:
+                print(f"❌ {path} differs from the detail response: {differences}")
+                ok = False
+            else:
+                print(f"✅ {path} item matches the detail response")
+        return ok
+
+    except requests.exceptions.ConnectionError:
+        print("❌ Cannot connect to API")
+        print("   Make sure your backend is running: python main.py")
+        return False
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("""
+                UPDATE products
+                SET current_stock_quantity = :current_stock_quantity,
+                    estimated_consumption_rate_per_day = :estimated_consumption_rate_per_day
+                WHERE id = :id
+            """), dict(product))
+        print(f"🧹 Restored product {product_id}")
+
+
+if __name__ == "__main__":
+    sys.exit(0 if test_catalogue_payload_shape() else 1)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test logging in with a legacy SHA-256 password hash
+
+Creates a throwaway user whose password is stored in the pre-bcrypt
+salt:sha256 format, logs in against the running API, and checks that the
+login returns a token and upgrades the stored hash to bcrypt.
+"""
+import hashlib
+import secrets
+import sys
+
+import requests
+from sqlalchemy import text
+
+from app.core.database import engine
+
+BASE_URL = "http://localhost:8001"
+
+EMAIL = f"legacy-login-{secrets.token_hex(4)}@hotel.com"
+PASSWORD = "legacy-password123"
+
+
+def legacy_hash(password: str) -> str:
+    """Hash a password the way users were stored before bcrypt (salt:sha256)."""
+    salt = secrets.token_hex(16)
+    return f"{salt}:{hashlib.sha256((salt + password).encode()).hexdigest()}"
+
+
+def test_legacy_password_login() -> bool:
+    print("🧪 TESTING LOGIN WITH A LEGACY PASSWORD HASH")
+    print("=" * 50)
+
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO users (email, hashed_password, first_name, last_name, role, is_active)
+            VALUES (:email, :hashed_password, 'Legacy', 'Login', 'staff', true)
+        """), {"email": EMAIL, "hashed_password": legacy_hash(PASSWORD)})
+    print(f"👤 Created {EMAIL} with a legacy hash")
+
+    try:
+        response = requests.post(
+            f"{BASE_URL}/auth/login/json",
+            json={"email": EMAIL, "password": PASSWORD},
+            timeout=10
+        )
+        print(f"📋 Response status: {response.status_code}")
+        if response.status_code != 200:
+            print(f"❌ LOGIN FAILED: {response.text}")
+            return False
+
+        data = response.json()
+        if not data.get("access_token") or data.get("user", {}).get("email") != EMAIL:
+            print(f"❌ Unexpected token response: {data}")
+            return False
+        print("✅ Login returned a token")
+
+        with engine.connect() as conn:
+            stored = conn.execute(
+                text("SELECT hashed_password FROM users WHERE email = :email"), {"email": EMAIL}
+            ).scalar()
+        if not stored.startswith("$2"):
+            print(f"❌ Hash was not upgraded to bcrypt: {stored[:20]}...")
+            return False
+        print("✅ Stored hash upgraded to bcrypt")
+
+        # The second login goes through bcrypt
+        response = requests.post(
+            f"{BASE_URL}/auth/login/json",
+            json={"email": EMAIL, "password": PASSWORD},
+            timeout=10
+        )
+        if response.status_code != 200:
+            print(f"❌ Second login failed: {response.status_code} {response.text}")
+            return False
+        print("✅ Second login successful")
+        return True
+
+    except requests.exceptions.ConnectionError:
+        print("❌ Cannot connect to API")
+        print("   Make sure your backend is running: python main.py")
+        return False
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM users WHERE email = :email"), {"email": EMAIL})
+        print(f"🧹 Removed {EMAIL}")
+
+
+if __name__ == "__main__":
+    sys.exit(0 if test_legacy_password_login() else 1)